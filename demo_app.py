@@ -31,61 +31,657 @@ This demo showcases the keyboard navigation framework:
 Run with: python demo_app.py
 """
 
+import functools
+import hashlib
+import threading
+import time
 from dataclasses import dataclass, field
+from types import MappingProxyType
+
+from fasthtml.common import (
+    fast_app, Div, H1, H2, H3, P, Span, A, Ul, Li, Main, Script,
+    APIRouter, Button, Form, Hidden, HttpHeader, NotStr, Response, to_xml
+)
+
+# DaisyUI and Tailwind utilities
+from cjm_fasthtml_daisyui.core.resources import get_daisyui_headers
+from cjm_fasthtml_daisyui.core.testing import create_theme_persistence_script
+from cjm_fasthtml_daisyui.components.actions.button import btn, btn_colors, btn_sizes
+from cjm_fasthtml_daisyui.components.data_display.badge import badge, badge_colors
+from cjm_fasthtml_daisyui.components.data_display.card import card, card_body
+from cjm_fasthtml_daisyui.utilities.semantic_colors import bg_dui, text_dui, border_dui, ring_dui
+
+from cjm_fasthtml_tailwind.utilities.spacing import p, m
+from cjm_fasthtml_tailwind.utilities.sizing import container, max_w, w, h, min_h
+from cjm_fasthtml_tailwind.utilities.typography import font_size, font_weight, text_align, font_family
+from cjm_fasthtml_tailwind.utilities.flexbox_and_grid import (
+    flex_display, flex_direction, items, justify, grid_display, grid_cols, gap, grow
+)
+from cjm_fasthtml_tailwind.utilities.borders import border, rounded, divide
+from cjm_fasthtml_tailwind.utilities.layout import overflow
+from cjm_fasthtml_tailwind.utilities.interactivity import cursor
+from cjm_fasthtml_tailwind.utilities.transitions_and_animation import transition, animate
+from cjm_fasthtml_tailwind.utilities.effects import shadow, ring, ring_color, inset_ring
+from cjm_fasthtml_tailwind.core.base import combine_classes
+
+# Lucide icons
+from cjm_fasthtml_lucide_icons.factory import lucide_icon
+
+# App core utilities
+from cjm_fasthtml_app_core.components.navbar import create_navbar
+from cjm_fasthtml_app_core.core.routing import register_routes
+from cjm_fasthtml_app_core.core.layout import wrap_with_layout
+
+# Keyboard navigation components
+from cjm_fasthtml_keyboard_navigation.core.focus_zone import FocusZone
+from cjm_fasthtml_keyboard_navigation.core.actions import KeyAction
+from cjm_fasthtml_keyboard_navigation.core.modes import KeyboardMode
+from cjm_fasthtml_keyboard_navigation.core.manager import ZoneManager
+from cjm_fasthtml_keyboard_navigation.core.navigation import (
+    LinearVertical, LinearHorizontal, Grid, ScrollOnly
+)
+from cjm_fasthtml_keyboard_navigation.core.key_mapping import (
+    ARROW_KEYS, WASD_KEYS, VIM_KEYS, ARROWS_AND_WASD
+)
+from cjm_fasthtml_keyboard_navigation.components.system import (
+    render_keyboard_system, KeyboardSystem
+)
+
+
+# =============================================================================
+# Shared Class Strings
+# =============================================================================
+
+# Focus class tuples shared by several zones
+_RING_FOCUS_PRIMARY = (str(ring(2)), str(ring_dui.primary), str(inset_ring(2)))
+_RING_FOCUS_SECONDARY = (str(ring(2)), str(ring_dui.secondary), str(inset_ring(2)))
+_RING_FOCUS_ACCENT = (str(ring(2)), str(ring_dui.accent), str(inset_ring(2)))
+_ITEM_FOCUS_PRIMARY = (str(bg_dui.primary.opacity(20)), str(ring(2)), str(ring_dui.primary))
+
+# List item classes
+_LIST_ITEM_BASE_CLS = combine_classes(
+    p(3), border.b(), border_dui.base_300,
+    cursor.pointer, transition.colors
+)
+_LIST_ITEM_SELECTED_CLS = _LIST_ITEM_BASE_CLS + " " + combine_classes(bg_dui.primary, text_dui.primary_content)
+_LIST_ITEM_ROW_CLS = combine_classes(flex_display, items.center, gap(2))
+_LIST_ITEM_NAME_CLS = str(grow())
+
+# Segment card classes
+_CARET_CLS = combine_classes(text_dui.error, font_weight.bold, animate.pulse)
+_SEGMENT_INDEX_CLS = combine_classes(font_family.mono, text_dui.base_content, font_size.sm)
+_SEGMENT_HEADER_CLS = combine_classes(m.b(2))
+_SEGMENT_TEXT_CLS = combine_classes(font_size.lg)
+_SEGMENT_CARD_CLS = combine_classes(
+    card, p(4), border(2), transition.all,
+    border_dui.base_300  # Base color - JS adds focus styling
+)
+
+# Home page and demo cards
+_HOME_CONTAINER_CLS = combine_classes(container, max_w._6xl, m.x.auto, p(8), text_align.center)
+_HOME_TITLE_CLS = combine_classes(font_size._4xl, font_weight.bold, m.b(4))
+_HOME_SUBTITLE_CLS = combine_classes(font_size.lg, text_dui.base_content, m.b(8))
+_HOME_GRID_CLS = combine_classes(grid_display, grid_cols(1), grid_cols(2).md, gap(6), m.b(8))
+_HOME_SECTION_TITLE_CLS = combine_classes(font_size._2xl, font_weight.bold, m.b(4))
+_CARD_CLS = combine_classes(card, bg_dui.base_200)
+_CARD_TITLE_CLS = combine_classes(font_size.xl, font_weight.semibold, m.b(2))
+_CARD_DESC_CLS = combine_classes(text_dui.base_content, m.b(4))
+_CARD_BADGES_CLS = combine_classes(flex_display, items.center, m.b(4))
+
+# Demo page layout
+_PAGE_2XL_CLS = combine_classes(container, max_w._2xl, m.x.auto, p(6))
+_PAGE_3XL_CLS = combine_classes(container, max_w._3xl, m.x.auto, p(6))
+_PAGE_4XL_CLS = combine_classes(container, max_w._4xl, m.x.auto, p(6))
+_PAGE_TITLE_CLS = combine_classes(font_size._2xl, font_weight.bold)
+_MUTED_TEXT_CLS = combine_classes(text_dui.base_content, font_size.sm)
+_MB1_CLS = combine_classes(m.b(1))
+_MB4_CLS = combine_classes(m.b(4))
+_MT4_CLS = combine_classes(m.t(4))
+_HINTS_BOX_CLS = combine_classes(m.b(4), p(4), bg_dui.base_200, rounded.lg, font_size.sm)
+_KEY_LABEL_CLS = combine_classes(font_family.mono, font_weight.bold)
+
+# Badges
+_BADGE_PRIMARY_CLS = combine_classes(badge, badge_colors.primary, m.r(2))
+_BADGE_SECONDARY_CLS = combine_classes(badge, badge_colors.secondary)
+_BADGE_ACCENT_CLS = combine_classes(badge, badge_colors.accent, m.r(2))
+_BADGE_WARNING_CLS = combine_classes(badge, badge_colors.warning, m.r(2))
+_BADGE_INFO_CLS = combine_classes(badge, badge_colors.info, m.r(2))
+_BADGE_SUCCESS_CLS = combine_classes(badge, badge_colors.success, m.r(2))
+_BADGE_PRIMARY_ICON_CLS = combine_classes(badge, badge_colors.primary, m.r(2), flex_display, items.center)
+_BADGE_SECONDARY_ICON_CLS = combine_classes(badge, badge_colors.secondary, flex_display, items.center)
+_BADGE_WARNING_ICON_CLS = combine_classes(badge, badge_colors.warning, flex_display, items.center)
+_MODE_BADGE_NAV_CLS = combine_classes(badge, badge_colors.primary)
+_MODE_BADGE_SPLIT_CLS = combine_classes(badge, badge_colors.warning)
+
+# Lists and panels
+_LIST_CLS = combine_classes(border(), rounded.lg, overflow.hidden, divide.y())
+_PANEL_CLS = combine_classes(grow(), p(2))
+_PANEL_GRID_CLS = combine_classes(grid_display, grid_cols(2), gap(4))
+_PANEL_TITLE_CLS = combine_classes(font_weight.semibold, m.b(2))
+_PANEL_UL_CLS = combine_classes(border(), rounded.lg, overflow.hidden, divide.y(), min_h(64))
+_EMPTY_ITEM_CLS = combine_classes(p(4), text_align.center)
+_SEGMENT_LIST_CLS = combine_classes(flex_display, flex_direction.col, gap(4))
+
+# Hierarchical demo
+_HIERARCHY_STATUS_CLS = combine_classes(p(3), m.b(4), rounded.lg, bg_dui.base_200, font_size.sm, font_family.mono)
+_CHILD_GRID_CLS = combine_classes(grid_display, grid_cols(2), gap(4), m.b(4))
+_CHILD_PANEL_CLS = combine_classes(p(4), rounded.lg, border(), border_dui.base_300, transition.all)
+_CHILD_A_TITLE_CLS = combine_classes(font_weight.semibold, m.b(2), text_dui.primary)
+_CHILD_B_TITLE_CLS = combine_classes(font_weight.semibold, m.b(2), text_dui.secondary)
+
+# =============================================================================
+# Prerendered Icons
+# =============================================================================
+
+# Icon markup never changes, so each icon is serialized once and reused as-is
+_ICON_CHECK_SUCCESS = NotStr(to_xml(lucide_icon("check", size=4, cls=str(text_dui.success))))
+_ICON_ARROW_RIGHT_4 = NotStr(to_xml(lucide_icon("arrow-right", size=4)))
+_ICON_ARROW_DOWN_UP_3 = NotStr(to_xml(lucide_icon("arrow-down-up", size=3)))
+_ICON_ARROW_LEFT_RIGHT_3 = NotStr(to_xml(lucide_icon("arrow-left-right", size=3)))
+_ICON_ARROW_BIG_UP_3 = NotStr(to_xml(lucide_icon("arrow-big-up", size=3)))
+_ICON_CORNER_DOWN_LEFT_3 = NotStr(to_xml(lucide_icon("corner-down-left", size=3)))
+_ICON_MOVE_RIGHT_3 = NotStr(to_xml(lucide_icon("move-right", size=3)))
+_ICON_X_3 = NotStr(to_xml(lucide_icon("x", size=3)))
+_ICON_LAYERS_3 = NotStr(to_xml(lucide_icon("layers", size=3)))
+
+# =============================================================================
+# Prerendered Static Blocks
+# =============================================================================
+
+_FEATURE_LIST = (
+    "Multi-zone focus management",
+    "Declarative action bindings",
+    "Mode system with transitions",
+    "HTMX + JS callback support",
+    "Custom key mappings (WASD, Vim, etc.)",
+    "Hierarchical keyboard systems with coordinator",
+    "State persistence support",
+    "Keyboard hints UI",
+    "Grid navigation ready",
+)
+
+# Homepage features list
+_FEATURES_HTML = NotStr(to_xml(Div(
+    *[Div(
+        _ICON_CHECK_SUCCESS,
+        Span(feature, cls=m.l(2)),
+        cls=combine_classes(flex_display, items.center, m.b(2))
+    ) for feature in _FEATURE_LIST],
+    cls=combine_classes(text_align.left, max_w.md, m.x.auto)
+)))
+
+# Toggles of the same item closer together than this are treated as key repeat
+_TOGGLE_DEBOUNCE_S = 0.03
+
+# Marker used to split the serialized page shell around the page content
+_CONTENT_PLACEHOLDER = "__content_placeholder__"
+
+def _content_hash(data: bytes) -> str:
+    """Short, process-independent hash used for ETags and script cache-busting."""
+    return hashlib.md5(data, usedforsecurity=False).hexdigest()[:16]
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Whether an `If-None-Match` header (a comma-separated list, possibly weak) matches `etag`."""
+    if not if_none_match:
+        return False
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return any(tag in ("*", etag) for tag in candidates)
+
+# Dual panel focus-change callbacks, served as a cacheable script referenced
+# from the app headers rather than inlined into every page
+_DUAL_CALLBACKS_JS = b"""
+function onSourceFocusChange(item, index, zoneId) {
+    console.log('Source focus:', item?.dataset?.itemId, 'at index', index);
+}
+function onQueueFocusChange(item, index, zoneId) {
+    console.log('Queue focus:', item?.dataset?.itemId, 'at index', index);
+}
+"""
+_DUAL_CALLBACKS_HASH = _content_hash(_DUAL_CALLBACKS_JS)
+
+# WASD demo key mapping badges
+_WASD_MAPPING_INFO = NotStr(to_xml(Div(
+    H3("Active Mapping: WASD", cls=combine_classes(font_weight.semibold, m.b(2))),
+    Div(
+        Span("W = Up", cls=combine_classes(badge, badge_colors.accent, m.r(2))),
+        Span("S = Down", cls=combine_classes(badge, badge_colors.accent, m.r(2))),
+        Span("A = Left", cls=combine_classes(badge, badge_colors.accent, m.r(2))),
+        Span("D = Right", cls=combine_classes(badge, badge_colors.accent)),
+    ),
+    cls=combine_classes(m.b(4), p(4), bg_dui.base_200, rounded.lg)
+)))
+
+# Mode demo callbacks for entering/exiting split mode, served as a cacheable script
+_MODE_CALLBACKS_JS = b"""
+    function enterSplitMode(modeName, zoneId) {
+        console.log('Entered split mode');
+        document.getElementById('mode-indicator').textContent = 'Split';
+        document.getElementById('mode-indicator').className = 'badge badge-warning';
+    }
+    function exitSplitMode(modeName, zoneId) {
+        console.log('Exited split mode');
+        document.getElementById('mode-indicator').textContent = 'Navigation';
+        document.getElementById('mode-indicator').className = 'badge badge-primary';
+    }
+    function onModeChange(newMode, oldMode) {
+        console.log('Mode changed from', oldMode, 'to', newMode);
+    }
+"""
+_MODE_CALLBACKS_HASH = _content_hash(_MODE_CALLBACKS_JS)
 
+# Rendered `<li>` markup keyed by every render input (item_id, name,
+# is_selected, item_attr), so an entry can never be served for a different row.
+# The demo item sets are fixed, which keeps the cache bounded.
+_LI_CACHE: dict[tuple[str, str, bool, str], str] = {}
 
-def main():
-    """Main entry point - initializes keyboard navigation demos."""
-    from fasthtml.common import (
-        fast_app, Div, H1, H2, H3, P, Span, A, Ul, Li, Script,
-        APIRouter, Button, Form, Hidden
-    )
+_CARET_XML = to_xml(Span("|", cls=_CARET_CLS))
 
-    # DaisyUI and Tailwind utilities
-    from cjm_fasthtml_daisyui.core.resources import get_daisyui_headers
-    from cjm_fasthtml_daisyui.core.testing import create_theme_persistence_script
-    from cjm_fasthtml_daisyui.components.actions.button import btn, btn_colors, btn_sizes
-    from cjm_fasthtml_daisyui.components.data_display.badge import badge, badge_colors
-    from cjm_fasthtml_daisyui.components.data_display.card import card, card_body
-    from cjm_fasthtml_daisyui.utilities.semantic_colors import bg_dui, text_dui, border_dui, ring_dui
-
-    from cjm_fasthtml_tailwind.utilities.spacing import p, m
-    from cjm_fasthtml_tailwind.utilities.sizing import container, max_w, w, h, min_h
-    from cjm_fasthtml_tailwind.utilities.typography import font_size, font_weight, text_align, font_family
-    from cjm_fasthtml_tailwind.utilities.flexbox_and_grid import (
-        flex_display, flex_direction, items, justify, grid_display, grid_cols, gap, grow
-    )
-    from cjm_fasthtml_tailwind.utilities.borders import border, rounded, divide
-    from cjm_fasthtml_tailwind.utilities.layout import overflow
-    from cjm_fasthtml_tailwind.utilities.interactivity import cursor
-    from cjm_fasthtml_tailwind.utilities.transitions_and_animation import transition, animate
-    from cjm_fasthtml_tailwind.utilities.effects import shadow, ring, ring_color, inset_ring
-    from cjm_fasthtml_tailwind.core.base import combine_classes
-
-    # Lucide icons
-    from cjm_fasthtml_lucide_icons.factory import lucide_icon
-
-    # App core utilities
-    from cjm_fasthtml_app_core.components.navbar import create_navbar
-    from cjm_fasthtml_app_core.core.routing import register_routes
-    from cjm_fasthtml_app_core.core.htmx import handle_htmx_request
-    from cjm_fasthtml_app_core.core.layout import wrap_with_layout
-
-    # Keyboard navigation components
-    from cjm_fasthtml_keyboard_navigation.core.focus_zone import FocusZone
-    from cjm_fasthtml_keyboard_navigation.core.actions import KeyAction
-    from cjm_fasthtml_keyboard_navigation.core.modes import KeyboardMode
-    from cjm_fasthtml_keyboard_navigation.core.manager import ZoneManager
-    from cjm_fasthtml_keyboard_navigation.core.navigation import (
-        LinearVertical, LinearHorizontal, Grid
-    )
-    from cjm_fasthtml_keyboard_navigation.core.key_mapping import (
-        ARROW_KEYS, WASD_KEYS, VIM_KEYS, ARROWS_AND_WASD
-    )
-    from cjm_fasthtml_keyboard_navigation.components.system import (
-        render_keyboard_system, KeyboardSystem
-    )
 
+@functools.lru_cache(maxsize=128)
+def _word_spans_xml(text: str) -> tuple[str, ...]:
+    """Prerendered `<span>word </span>` markup for split mode, keyed by segment text."""
+    return tuple(to_xml(Span(word + " ")) for word in text.split(" "))
+
+
+@functools.lru_cache(maxsize=256)
+def _segment_card_xml(segment_id, text, index, is_active, mode, caret_pos):
+    """Serialized segment card, memoized on its (hashable) render inputs."""
+    # Always use base border color - JavaScript handles focus styling
+    # This prevents conflict between server-side active_cls and JS focus classes
+    content = text
+    if is_active and mode == "split":
+        # Show caret in split mode: splice it between the prerendered word spans
+        parts = _word_spans_xml(content)
+        content = NotStr("".join(parts[:caret_pos]) + _CARET_XML + "".join(parts[caret_pos:]))
+
+    return to_xml(Div(
+        Div(
+            Span(f"#{index + 1}", cls=_SEGMENT_INDEX_CLS),
+            cls=_SEGMENT_HEADER_CLS
+        ),
+        Div(
+            content,
+            cls=_SEGMENT_TEXT_CLS
+        ),
+        cls=_SEGMENT_CARD_CLS,
+        **{"data-segment-id": segment_id}
+    ))
+
+
+# =============================================================================
+# Demo State
+# =============================================================================
+
+@dataclass(slots=True)
+class DemoState:
+    """State for demo applications (items stored as one tuple of (id, name) pairs)."""
+    items: tuple = ()  # (id, name) pairs; republished as a new tuple on every change
+    selected_indices: set = field(default_factory=set)
+    queue: tuple = ()  # item ids; republished as a new tuple on every change
+    all_selected: bool = False  # every item selected; selected_indices is unused while set
+    rev: int = 0  # bumped by every mutating handler; keys the page cache
+    _id_to_idx: dict = field(default_factory=dict, repr=False)
+    _queue_pos: dict = field(default_factory=dict, repr=False)  # queued id -> position in queue
+    # Held for every item/queue read-modify-write; renders read the published tuples lock-free
+    _write_lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    @classmethod
+    def from_items(cls, items, **kwargs):
+        """Create state from a list of `{"id": ..., "name": ...}` item dicts."""
+        return cls(
+            items=tuple((item["id"], item["name"]) for item in items),
+            **kwargs
+        )
+
+    def __post_init__(self):
+        # Built eagerly so unlocked readers never write the map; only remove_item replaces it
+        self._id_to_idx = {id_: i for i, (id_, _) in enumerate(self.items)}
+
+    def index_of(self, item_id):
+        """Return the position of an item id (None if absent)."""
+        return self._id_to_idx.get(item_id)
+
+    def name_of(self, item_id):
+        """Return the display name for an item id."""
+        return self.items[self.index_of(item_id)][1]
+
+    def remove_item(self, item_id):
+        """Remove an item by id and drop it from the selection, keeping the id -> index map current."""
+        with self._write_lock:
+            idx = self.index_of(item_id)
+            if idx is None:
+                return
+            # Ids and names are published together, so readers never see them out of step
+            items = self.items[:idx] + self.items[idx + 1:]
+            self.items = items
+            # Rebound whole rather than shifted in place, so lock-free lookups never see a half-updated map
+            self._id_to_idx = {id_: i for i, (id_, _) in enumerate(items)}
+            self.selected_indices.discard(item_id)
+            self.rev += 1
+
+    def enqueue(self, item_id):
+        """Append a known item id to the queue unless it is already queued."""
+        with self._write_lock:
+            if item_id in self._queue_pos or self.index_of(item_id) is None:
+                return
+            self._queue_pos[item_id] = len(self.queue)
+            self.queue = self.queue + (item_id,)
+            self.rev += 1
+
+    def dequeue(self, item_id):
+        """Remove an item id from the queue, shifting the positions after it."""
+        with self._write_lock:
+            pos = self._queue_pos.pop(item_id, None)
+            if pos is None:
+                return
+            self.queue = self.queue[:pos] + self.queue[pos + 1:]
+            for id_ in self.queue[pos:]:
+                self._queue_pos[id_] -= 1
+            self.rev += 1
+
+    def move_queued(self, item_id, offset):
+        """Swap a queued item with its neighbour `offset` places away (no-op at the ends)."""
+        with self._write_lock:
+            pos = self._queue_pos.get(item_id)
+            if pos is None or not 0 <= pos + offset < len(self.queue):
+                return
+            queue = list(self.queue)
+            other = queue[pos + offset]
+            queue[pos], queue[pos + offset] = other, item_id
+            self._queue_pos[item_id], self._queue_pos[other] = pos + offset, pos
+            self.queue = tuple(queue)
+            self.rev += 1
+
+
+# =============================================================================
+# Demo 1: Simple Single-Zone List
+# =============================================================================
+
+simple_zone = FocusZone(
+    id="simple-list",
+    item_selector="li[data-item-id]",
+    navigation=LinearVertical(),
+    data_attributes=("item-id",),
+    zone_focus_classes=_RING_FOCUS_PRIMARY,
+    item_focus_classes=_ITEM_FOCUS_PRIMARY,
+)
+
+simple_actions = (
+    KeyAction(
+        key=" ",
+        htmx_trigger="simple-toggle-btn",
+        description="Toggle selection",
+        hint_group="Selection"
+    ),
+    KeyAction(
+        key="Enter",
+        htmx_trigger="simple-toggle-btn",
+        description="Toggle selection",
+        hint_group="Selection",
+        show_in_hints=False
+    ),
+    KeyAction(
+        key="Delete",
+        htmx_trigger="simple-delete-btn",
+        description="Remove item",
+        hint_group="Actions"
+    ),
+    KeyAction(
+        key="a",
+        modifiers=frozenset({"ctrl"}),
+        htmx_trigger="simple-select-all-btn",
+        description="Select all",
+        hint_group="Selection"
+    ),
+)
+
+simple_manager = ZoneManager(
+    zones=(simple_zone,),
+    actions=simple_actions,
+)
+
+# =============================================================================
+# Demo 2: Dual Panel Navigation
+# =============================================================================
+
+source_zone = FocusZone(
+    id="source-panel",
+    item_selector="li[data-item-id]",
+    navigation=LinearVertical(),
+    data_attributes=("item-id",),
+    zone_focus_classes=_RING_FOCUS_PRIMARY,
+    item_focus_classes=(str(bg_dui.primary.opacity(10)), str(ring(1)), str(ring_dui.primary)),
+    on_focus_change="onSourceFocusChange",
+)
+
+queue_zone = FocusZone(
+    id="queue-panel",
+    item_selector="li[data-item-id]",
+    navigation=LinearVertical(),
+    data_attributes=("item-id",),
+    zone_focus_classes=_RING_FOCUS_SECONDARY,
+    item_focus_classes=(str(bg_dui.secondary.opacity(10)), str(ring(1)), str(ring_dui.secondary)),
+    on_focus_change="onQueueFocusChange",
+)
+
+dual_actions = (
+    KeyAction(
+        key=" ",
+        htmx_trigger="dual-add-btn",
+        zone_ids=("source-panel",),
+        description="Add to queue",
+        hint_group="Queue"
+    ),
+    KeyAction(
+        key="Delete",
+        htmx_trigger="dual-remove-btn",
+        zone_ids=("queue-panel",),
+        description="Remove from queue",
+        hint_group="Queue"
+    ),
+    KeyAction(
+        key="ArrowUp",
+        modifiers=frozenset({"shift"}),
+        htmx_trigger="dual-move-up-btn",
+        zone_ids=("queue-panel",),
+        description="Move up in queue",
+        hint_group="Reorder"
+    ),
+    KeyAction(
+        key="ArrowDown",
+        modifiers=frozenset({"shift"}),
+        htmx_trigger="dual-move-down-btn",
+        zone_ids=("queue-panel",),
+        description="Move down in queue",
+        hint_group="Reorder"
+    ),
+)
+
+dual_manager = ZoneManager(
+    zones=(source_zone, queue_zone),
+    actions=dual_actions,
+    prev_zone_key="ArrowLeft",
+    next_zone_key="ArrowRight",
+)
+
+# =============================================================================
+# Demo 3: Mode Switching
+# =============================================================================
+
+segment_zone = FocusZone(
+    id="segment-list",
+    item_selector="div[data-segment-id]",
+    navigation=LinearVertical(),
+    data_attributes=("segment-id",),
+    zone_focus_classes=(str(ring(2)), str(ring_dui.primary)),
+    item_focus_classes=(str(border_dui.primary), str(bg_dui.primary.opacity(5)), str(shadow.md)),
+)
+
+# Note: In a full implementation, split mode would have LinearHorizontal navigation
+# for caret movement within segments. Since caret tracking isn't implemented,
+# we use ScrollOnly to disable navigation in split mode.
+split_mode = KeyboardMode(
+    name="split",
+    enter_key="Enter",
+    exit_key="Escape",
+    navigation_override=ScrollOnly(),  # Disables navigation (no caret tracking)
+    on_enter="enterSplitMode",
+    on_exit="exitSplitMode",
+    indicator_text="Split Mode",
+    zone_ids=("segment-list",),
+)
+
+mode_actions = (
+    KeyAction(
+        key="Backspace",
+        htmx_trigger="mode-merge-btn",
+        mode_names=("navigation",),
+        description="Merge with previous",
+        hint_group="Editing"
+    ),
+    KeyAction(
+        key="Enter",
+        htmx_trigger="mode-split-btn",
+        mode_names=("split",),
+        description="Split at caret",
+        hint_group="Editing"
+    ),
+)
+
+mode_manager = ZoneManager(
+    zones=(segment_zone,),
+    modes=(split_mode,),
+    actions=mode_actions,
+    on_mode_change="onModeChange",
+)
+
+# =============================================================================
+# Demo 4: Custom Key Mappings
+# =============================================================================
+
+wasd_zone = FocusZone(
+    id="wasd-list",
+    item_selector="li[data-item-id]",
+    navigation=LinearVertical(),
+    data_attributes=("item-id",),
+    zone_focus_classes=_RING_FOCUS_ACCENT,
+    item_focus_classes=(str(bg_dui.accent.opacity(20)), str(ring(2)), str(ring_dui.accent)),
+)
+
+wasd_actions = (
+    KeyAction(
+        key="f",
+        htmx_trigger="wasd-action-btn",
+        description="Interact",
+        hint_group="Actions"
+    ),
+)
+
+wasd_manager = ZoneManager(
+    zones=(wasd_zone,),
+    actions=wasd_actions,
+    key_mapping=WASD_KEYS,
+)
+
+
+# =============================================================================
+# Demo 5: Hierarchical Systems
+# =============================================================================
+
+# --- Child system A: vertical list ---
+child_a_zone = FocusZone(
+    id="child-a-list",
+    item_selector="li[data-item-id]",
+    navigation=LinearVertical(),
+    data_attributes=("item-id",),
+    zone_focus_classes=_RING_FOCUS_PRIMARY,
+    item_focus_classes=(str(bg_dui.primary.opacity(20)), str(ring(1)), str(ring_dui.primary)),
+)
+child_a_actions = (
+    KeyAction(
+        key=" ",
+        htmx_trigger="child-a-toggle-btn",
+        description="Toggle selection",
+        hint_group="Selection",
+    ),
+    KeyAction(
+        key="Enter",
+        htmx_trigger="child-a-toggle-btn",
+        description="Toggle selection",
+        hint_group="Selection",
+        show_in_hints=False,
+    ),
+)
+child_a_manager = ZoneManager(
+    zones=(child_a_zone,),
+    actions=child_a_actions,
+    system_id="child-a",
+)
+
+# --- Child system B: vertical list ---
+child_b_zone = FocusZone(
+    id="child-b-list",
+    item_selector="li[data-item-id]",
+    navigation=LinearVertical(),
+    data_attributes=("item-id",),
+    zone_focus_classes=_RING_FOCUS_SECONDARY,
+    item_focus_classes=(str(bg_dui.secondary.opacity(20)), str(ring(1)), str(ring_dui.secondary)),
+)
+child_b_actions = (
+    KeyAction(
+        key=" ",
+        htmx_trigger="child-b-toggle-btn",
+        description="Toggle selection",
+        hint_group="Selection",
+    ),
+    KeyAction(
+        key="Enter",
+        htmx_trigger="child-b-toggle-btn",
+        description="Toggle selection",
+        hint_group="Selection",
+        show_in_hints=False,
+    ),
+)
+child_b_manager = ZoneManager(
+    zones=(child_b_zone,),
+    actions=child_b_actions,
+    system_id="child-b",
+)
+
+# --- Parent system: ghost zones for target navigation ---
+ghost_zone_a = FocusZone(
+    id="ghost-a",
+    item_selector=None,
+    navigation=ScrollOnly(),
+    zone_focus_classes=(str(ring(2)), str(ring_dui.primary)),
+)
+ghost_zone_b = FocusZone(
+    id="ghost-b",
+    item_selector=None,
+    navigation=ScrollOnly(),
+    zone_focus_classes=(str(ring(2)), str(ring_dui.secondary)),
+)
+
+parent_actions = (
+    # Enter activates the child corresponding to the active ghost zone
+    KeyAction(
+        key="Enter",
+        js_callback="activateHighlightedChild",
+        description="Activate area",
+        hint_group="Navigation",
+    ),
+)
+parent_manager = ZoneManager(
+    zones=(ghost_zone_a, ghost_zone_b),
+    actions=parent_actions,
+    system_id="hierarchy-parent",
+    prev_zone_key="ArrowLeft",
+    next_zone_key="ArrowRight",
+)
+
+
+def main():
+    """Main entry point - initializes keyboard navigation demos."""
     print("\n" + "=" * 70)
     print("Initializing cjm-fasthtml-keyboard-navigation Demo")
     print("=" * 70)
@@ -110,16 +706,9 @@ def main():
     # Demo Data and State
     # =========================================================================
 
-    @dataclass
-    class DemoState:
-        """State for demo applications."""
-        items: list = field(default_factory=list)
-        selected_indices: set = field(default_factory=set)
-        queue: list = field(default_factory=list)
-
     # Demo 1: Simple list state
-    simple_list_state = DemoState(
-        items=[
+    simple_list_state = DemoState.from_items(
+        [
             {"id": "1", "name": "Document A", "type": "pdf"},
             {"id": "2", "name": "Image B", "type": "png"},
             {"id": "3", "name": "Spreadsheet C", "type": "xlsx"},
@@ -132,32 +721,37 @@ def main():
     )
 
     # Demo 2: Dual panel state
-    dual_panel_state = DemoState(
-        items=[
+    dual_panel_state = DemoState.from_items(
+        [
             {"id": "src-1", "name": "Source Item 1"},
             {"id": "src-2", "name": "Source Item 2"},
             {"id": "src-3", "name": "Source Item 3"},
             {"id": "src-4", "name": "Source Item 4"},
             {"id": "src-5", "name": "Source Item 5"},
-        ],
-        queue=[]
+        ]
     )
 
     # Demo 3: Mode switching state
     mode_demo_state = {
-        "segments": [
-            {"id": "seg-1", "text": "The art of war is of vital importance to the state."},
-            {"id": "seg-2", "text": "It is a matter of life and death."},
-            {"id": "seg-3", "text": "A road either to safety or to ruin."},
-        ],
+        # Read-only segments; mode_merge publishes a new tuple instead of mutating
+        "segments": (
+            MappingProxyType({"id": "seg-1", "text": "The art of war is of vital importance to the state."}),
+            MappingProxyType({"id": "seg-2", "text": "It is a matter of life and death."}),
+            MappingProxyType({"id": "seg-3", "text": "A road either to safety or to ruin."}),
+        ),
         "active_segment": 0,
         "mode": "navigation",
-        "caret_position": 0
+        "caret_position": 0,
+        "rev": 0
     }
+    # Segment id -> position, kept in step with each published segments tuple
+    mode_demo_state["segment_pos"] = {seg["id"]: i for i, seg in enumerate(mode_demo_state["segments"])}
+    # Serializes mode_merge's read-modify-write; renders read the published tuple lock-free
+    mode_write_lock = threading.Lock()
 
     # Demo 4: WASD state
-    wasd_demo_state = DemoState(
-        items=[
+    wasd_demo_state = DemoState.from_items(
+        [
             {"id": "w1", "name": "Move Forward"},
             {"id": "w2", "name": "Jump"},
             {"id": "w3", "name": "Attack"},
@@ -166,629 +760,368 @@ def main():
         ]
     )
 
-    print("\n[1/4] Creating demo configurations...")
-
-    # =========================================================================
-    # Demo 1: Simple Single-Zone List
-    # =========================================================================
-
-    simple_zone = FocusZone(
-        id="simple-list",
-        item_selector="li[data-item-id]",
-        navigation=LinearVertical(),
-        data_attributes=("item-id",),
-        zone_focus_classes=(str(ring(2)), str(ring_dui.primary), str(inset_ring(2))),
-        item_focus_classes=(str(bg_dui.primary.opacity(20)), str(ring(2)), str(ring_dui.primary)),
-    )
-
-    simple_actions = (
-        KeyAction(
-            key=" ",
-            htmx_trigger="simple-toggle-btn",
-            description="Toggle selection",
-            hint_group="Selection"
-        ),
-        KeyAction(
-            key="Enter",
-            htmx_trigger="simple-toggle-btn",
-            description="Toggle selection",
-            hint_group="Selection",
-            show_in_hints=False
-        ),
-        KeyAction(
-            key="Delete",
-            htmx_trigger="simple-delete-btn",
-            description="Remove item",
-            hint_group="Actions"
-        ),
-        KeyAction(
-            key="a",
-            modifiers=frozenset({"ctrl"}),
-            htmx_trigger="simple-select-all-btn",
-            description="Select all",
-            hint_group="Selection"
-        ),
-    )
-
-    simple_manager = ZoneManager(
-        zones=(simple_zone,),
-        actions=simple_actions,
-    )
-
-    # =========================================================================
-    # Demo 2: Dual Panel Navigation
-    # =========================================================================
-
-    source_zone = FocusZone(
-        id="source-panel",
-        item_selector="li[data-item-id]",
-        navigation=LinearVertical(),
-        data_attributes=("item-id",),
-        zone_focus_classes=(str(ring(2)), str(ring_dui.primary), str(inset_ring(2))),
-        item_focus_classes=(str(bg_dui.primary.opacity(10)), str(ring(1)), str(ring_dui.primary)),
-        on_focus_change="onSourceFocusChange",
-    )
-
-    queue_zone = FocusZone(
-        id="queue-panel",
-        item_selector="li[data-item-id]",
-        navigation=LinearVertical(),
-        data_attributes=("item-id",),
-        zone_focus_classes=(str(ring(2)), str(ring_dui.secondary), str(inset_ring(2))),
-        item_focus_classes=(str(bg_dui.secondary.opacity(10)), str(ring(1)), str(ring_dui.secondary)),
-        on_focus_change="onQueueFocusChange",
-    )
-
-    dual_actions = (
-        KeyAction(
-            key=" ",
-            htmx_trigger="dual-add-btn",
-            zone_ids=("source-panel",),
-            description="Add to queue",
-            hint_group="Queue"
-        ),
-        KeyAction(
-            key="Delete",
-            htmx_trigger="dual-remove-btn",
-            zone_ids=("queue-panel",),
-            description="Remove from queue",
-            hint_group="Queue"
-        ),
-        KeyAction(
-            key="ArrowUp",
-            modifiers=frozenset({"shift"}),
-            htmx_trigger="dual-move-up-btn",
-            zone_ids=("queue-panel",),
-            description="Move up in queue",
-            hint_group="Reorder"
-        ),
-        KeyAction(
-            key="ArrowDown",
-            modifiers=frozenset({"shift"}),
-            htmx_trigger="dual-move-down-btn",
-            zone_ids=("queue-panel",),
-            description="Move down in queue",
-            hint_group="Reorder"
-        ),
-    )
-
-    dual_manager = ZoneManager(
-        zones=(source_zone, queue_zone),
-        actions=dual_actions,
-        prev_zone_key="ArrowLeft",
-        next_zone_key="ArrowRight",
-    )
-
-    # =========================================================================
-    # Demo 3: Mode Switching
-    # =========================================================================
-
-    segment_zone = FocusZone(
-        id="segment-list",
-        item_selector="div[data-segment-id]",
-        navigation=LinearVertical(),
-        data_attributes=("segment-id",),
-        zone_focus_classes=(str(ring(2)), str(ring_dui.primary)),
-        item_focus_classes=(str(border_dui.primary), str(bg_dui.primary.opacity(5)), str(shadow.md)),
-    )
-
-    # Note: In a full implementation, split mode would have LinearHorizontal navigation
-    # for caret movement within segments. Since caret tracking isn't implemented,
-    # we use ScrollOnly to disable navigation in split mode.
-    from cjm_fasthtml_keyboard_navigation.core.navigation import ScrollOnly
-    split_mode = KeyboardMode(
-        name="split",
-        enter_key="Enter",
-        exit_key="Escape",
-        navigation_override=ScrollOnly(),  # Disables navigation (no caret tracking)
-        on_enter="enterSplitMode",
-        on_exit="exitSplitMode",
-        indicator_text="Split Mode",
-        zone_ids=("segment-list",),
-    )
-
-    mode_actions = (
-        KeyAction(
-            key="Backspace",
-            htmx_trigger="mode-merge-btn",
-            mode_names=("navigation",),
-            description="Merge with previous",
-            hint_group="Editing"
-        ),
-        KeyAction(
-            key="Enter",
-            htmx_trigger="mode-split-btn",
-            mode_names=("split",),
-            description="Split at caret",
-            hint_group="Editing"
-        ),
-    )
-
-    mode_manager = ZoneManager(
-        zones=(segment_zone,),
-        modes=(split_mode,),
-        actions=mode_actions,
-        on_mode_change="onModeChange",
-    )
-
-    # =========================================================================
-    # Demo 4: Custom Key Mappings
-    # =========================================================================
-
-    wasd_zone = FocusZone(
-        id="wasd-list",
-        item_selector="li[data-item-id]",
-        navigation=LinearVertical(),
-        data_attributes=("item-id",),
-        zone_focus_classes=(str(ring(2)), str(ring_dui.accent), str(inset_ring(2))),
-        item_focus_classes=(str(bg_dui.accent.opacity(20)), str(ring(2)), str(ring_dui.accent)),
-    )
-
-    wasd_actions = (
-        KeyAction(
-            key="f",
-            htmx_trigger="wasd-action-btn",
-            description="Interact",
-            hint_group="Actions"
-        ),
-    )
-
-    wasd_manager = ZoneManager(
-        zones=(wasd_zone,),
-        actions=wasd_actions,
-        key_mapping=WASD_KEYS,
-    )
-
-    print("  Created 4 demo configurations:")
+    print("\n[1/4] Using 5 demo configurations:")
     print("    - Simple list (single zone, arrow keys)")
     print("    - Dual panel (two zones, panel switching)")
     print("    - Mode switching (navigation/split modes)")
     print("    - Custom keys (WASD mapping)")
+    print("    - Hierarchy (parent with two child systems)")
 
     # =========================================================================
     # Helper Functions
     # =========================================================================
 
-    def render_list_item(item, is_selected=False, item_attr="data-item-id"):
-        """Render a list item for the demos."""
-        selected_cls = combine_classes(bg_dui.primary, text_dui.primary_content) if is_selected else ""
-        check_icon = lucide_icon("check", size=4, cls=str(text_dui.success)) if is_selected else ""
-        return Li(
+    def render_list_item(item_id, name, is_selected=False, item_attr="data-item-id"):
+        """Render a list item for the demos as serialized markup."""
+        check_icon = _ICON_CHECK_SUCCESS if is_selected else ""
+        return to_xml(Li(
             Div(
-                Span(item.get("name", item.get("id", "Item")), cls=grow()),
+                Span(name, cls=_LIST_ITEM_NAME_CLS),
                 check_icon,
-                cls=combine_classes(flex_display, items.center, gap(2))
-            ),
-            cls=combine_classes(
-                p(3), border.b(), border_dui.base_300,
-                cursor.pointer, transition.colors,
-                selected_cls
+                cls=_LIST_ITEM_ROW_CLS
             ),
-            **{item_attr: item["id"]}
-        )
+            cls=_LIST_ITEM_SELECTED_CLS if is_selected else _LIST_ITEM_BASE_CLS,
+            **{item_attr: item_id}
+        ))
+
+    def cached_list_item(item_id, name, is_selected=False, item_attr="data-item-id"):
+        """Return the rendered markup for a list item, rendering it only on a cache miss."""
+        key = (item_id, name, is_selected, item_attr)
+        html = _LI_CACHE.get(key)
+        if html is None:
+            html = _LI_CACHE[key] = render_list_item(item_id, name, is_selected, item_attr)
+        return NotStr(html)
 
     def render_segment_card(segment, index, is_active=False, mode="navigation", caret_pos=0):
         """Render a segment card for mode switching demo."""
-        # Always use base border color - JavaScript handles focus styling
-        # This prevents conflict between server-side active_cls and JS focus classes
-        caret_cls = combine_classes(text_dui.error, font_weight.bold, animate.pulse)
-
-        content = segment["text"]
-        if is_active and mode == "split":
-            # Show caret in split mode
-            words = content.split(" ")
-            word_spans = []
-            for i, word in enumerate(words):
-                if i == caret_pos:
-                    word_spans.append(Span("|", cls=caret_cls))
-                word_spans.append(Span(word + " "))
-            if caret_pos >= len(words):
-                word_spans.append(Span("|", cls=caret_cls))
-            content = word_spans
+        return NotStr(_segment_card_xml(
+            segment["id"], segment["text"], index, is_active, mode, caret_pos
+        ))
+
+    # =========================================================================
+    # Routes
+    # =========================================================================
 
+    def render_demo_card(title, description, badges, route, color):
+        """Render a homepage card linking to one of the demos."""
         return Div(
             Div(
-                Span(f"#{index + 1}", cls=combine_classes(font_family.mono, text_dui.base_content, font_size.sm)),
-                cls=combine_classes(m.b(2))
+                H2(title,
+                   cls=_CARD_TITLE_CLS),
+                P(description,
+                  cls=_CARD_DESC_CLS),
+                Div(
+                    *badges,
+                    cls=_CARD_BADGES_CLS
+                ),
+                A(
+                    Span("Try Demo", cls=m.r(1)),
+                    _ICON_ARROW_RIGHT_4,
+                    href=route.to(),
+                    cls=combine_classes(btn, color, flex_display, items.center)
+                ),
+                cls=card_body
             ),
-            Div(
-                *content if isinstance(content, list) else [content],
-                cls=combine_classes(font_size.lg)
+            cls=_CARD_CLS
+        )
+
+    def demo_cards():
+        """Card specs for the homepage: (title, description, badges, route, button color)."""
+        return (
+            (
+                "Simple List",
+                "Single zone with arrow key navigation and selection.",
+                (
+                    Span(
+                        _ICON_ARROW_DOWN_UP_3,
+                        Span("Navigate", cls=m.l(1)),
+                        cls=_BADGE_PRIMARY_ICON_CLS
+                    ),
+                    Span(
+                        Span("Space", cls=_KEY_LABEL_CLS),
+                        Span("Select", cls=m.l(1)),
+                        cls=_BADGE_SECONDARY_ICON_CLS
+                    ),
+                ),
+                demo_simple,
+                btn_colors.primary,
             ),
-            cls=combine_classes(
-                card, p(4), border(2), transition.all,
-                border_dui.base_300  # Base color - JS adds focus styling
+            (
+                "Dual Panel",
+                "Two zones with panel switching and cross-panel actions.",
+                (
+                    Span(
+                        _ICON_ARROW_LEFT_RIGHT_3,
+                        Span("Switch", cls=m.l(1)),
+                        cls=_BADGE_PRIMARY_ICON_CLS
+                    ),
+                    Span(
+                        _ICON_ARROW_BIG_UP_3,
+                        _ICON_ARROW_DOWN_UP_3,
+                        Span("Reorder", cls=m.l(1)),
+                        cls=_BADGE_SECONDARY_ICON_CLS
+                    ),
+                ),
+                demo_dual,
+                btn_colors.secondary,
+            ),
+            (
+                "Mode Switching",
+                "Navigation mode → Split mode with Enter/Escape.",
+                (
+                    Span(
+                        _ICON_CORNER_DOWN_LEFT_3,
+                        _ICON_MOVE_RIGHT_3,
+                        Span("Split", cls=m.l(1)),
+                        cls=_BADGE_PRIMARY_ICON_CLS
+                    ),
+                    Span(
+                        _ICON_X_3,
+                        _ICON_MOVE_RIGHT_3,
+                        Span("Exit", cls=m.l(1)),
+                        cls=_BADGE_SECONDARY_ICON_CLS
+                    ),
+                ),
+                demo_modes,
+                btn_colors.accent,
+            ),
+            (
+                "Custom Key Mappings",
+                "WASD, Vim, or custom key mappings for navigation.",
+                (
+                    Span("WASD", cls=_BADGE_PRIMARY_CLS),
+                    Span("Vim (hjkl)", cls=_BADGE_SECONDARY_CLS),
+                ),
+                demo_wasd,
+                btn_colors.info,
+            ),
+            (
+                "Hierarchical Systems",
+                "Parent-child keyboard coordination with Escape/Enter activation.",
+                (
+                    Span(
+                        _ICON_LAYERS_3,
+                        Span("Hierarchy", cls=m.l(1)),
+                        cls=_BADGE_PRIMARY_ICON_CLS
+                    ),
+                    Span(
+                        Span("Esc", cls=_KEY_LABEL_CLS),
+                        Span("Deactivate", cls=m.l(1)),
+                        cls=_BADGE_WARNING_ICON_CLS
+                    ),
+                ),
+                demo_hierarchy,
+                btn_colors.warning,
             ),
-            **{"data-segment-id": segment["id"]}
         )
 
-    # =========================================================================
-    # Routes
-    # =========================================================================
+    def home_content():
+        """Render the homepage overview."""
+        return Div(
+            H1("Keyboard Navigation Demo",
+               cls=_HOME_TITLE_CLS),
+
+            P("A declarative keyboard navigation framework for FastHTML applications.",
+              cls=_HOME_SUBTITLE_CLS),
+
+            # Feature cards
+            Div(
+                (render_demo_card(*spec) for spec in demo_cards()),
+                cls=_HOME_GRID_CLS
+            ),
+
+            # Features list
+            Div(
+                H2("Features", cls=_HOME_SECTION_TITLE_CLS),
+                _FEATURES_HTML,
+                cls=m.b(8)
+            ),
+
+            cls=_HOME_CONTAINER_CLS
+        )
 
     @router
     def index(request):
         """Homepage with demo overview."""
+        return cached_page(request, "index", 0, home_content)
 
-        def home_content():
-            return Div(
-                H1("Keyboard Navigation Demo",
-                   cls=combine_classes(font_size._4xl, font_weight.bold, m.b(4))),
-
-                P("A declarative keyboard navigation framework for FastHTML applications.",
-                  cls=combine_classes(font_size.lg, text_dui.base_content, m.b(8))),
+    def serve_script(request, body, content_hash):
+        """Serve a constant script; its URL carries the content hash, so it can be cached forever."""
+        etag = f'"{content_hash}"'
+        headers = {"Cache-Control": "public, max-age=31536000, immutable", "ETag": etag}
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+        return Response(body, media_type="application/javascript", headers=headers)
 
-                # Feature cards
-                Div(
-                    # Simple list card
-                    Div(
-                        Div(
-                            H2("Simple List",
-                               cls=combine_classes(font_size.xl, font_weight.semibold, m.b(2))),
-                            P("Single zone with arrow key navigation and selection.",
-                              cls=combine_classes(text_dui.base_content, m.b(4))),
-                            Div(
-                                Span(
-                                    lucide_icon("arrow-down-up", size=3),
-                                    Span("Navigate", cls=m.l(1)),
-                                    cls=combine_classes(badge, badge_colors.primary, m.r(2), flex_display, items.center)
-                                ),
-                                Span(
-                                    Span("Space", cls=combine_classes(font_family.mono, font_weight.bold)),
-                                    Span("Select", cls=m.l(1)),
-                                    cls=combine_classes(badge, badge_colors.secondary, flex_display, items.center)
-                                ),
-                                cls=combine_classes(flex_display, items.center, m.b(4))
-                            ),
-                            A(
-                                Span("Try Demo", cls=m.r(1)),
-                                lucide_icon("arrow-right", size=4),
-                                href=demo_simple.to(),
-                                cls=combine_classes(btn, btn_colors.primary, flex_display, items.center)
-                            ),
-                            cls=card_body
-                        ),
-                        cls=combine_classes(card, bg_dui.base_200)
-                    ),
+    @router
+    def dual_callbacks_js(request):
+        """Dual panel focus-change callbacks."""
+        return serve_script(request, _DUAL_CALLBACKS_JS, _DUAL_CALLBACKS_HASH)
 
-                    # Dual panel card
-                    Div(
-                        Div(
-                            H2("Dual Panel",
-                               cls=combine_classes(font_size.xl, font_weight.semibold, m.b(2))),
-                            P("Two zones with panel switching and cross-panel actions.",
-                              cls=combine_classes(text_dui.base_content, m.b(4))),
-                            Div(
-                                Span(
-                                    lucide_icon("arrow-left-right", size=3),
-                                    Span("Switch", cls=m.l(1)),
-                                    cls=combine_classes(badge, badge_colors.primary, m.r(2), flex_display, items.center)
-                                ),
-                                Span(
-                                    lucide_icon("arrow-big-up", size=3),
-                                    lucide_icon("arrow-down-up", size=3),
-                                    Span("Reorder", cls=m.l(1)),
-                                    cls=combine_classes(badge, badge_colors.secondary, flex_display, items.center)
-                                ),
-                                cls=combine_classes(flex_display, items.center, m.b(4))
-                            ),
-                            A(
-                                Span("Try Demo", cls=m.r(1)),
-                                lucide_icon("arrow-right", size=4),
-                                href=demo_dual.to(),
-                                cls=combine_classes(btn, btn_colors.secondary, flex_display, items.center)
-                            ),
-                            cls=card_body
-                        ),
-                        cls=combine_classes(card, bg_dui.base_200)
-                    ),
+    @router
+    def mode_callbacks_js(request):
+        """Mode demo split-mode callbacks."""
+        return serve_script(request, _MODE_CALLBACKS_JS, _MODE_CALLBACKS_HASH)
 
-                    # Mode switching card
-                    Div(
-                        Div(
-                            H2("Mode Switching",
-                               cls=combine_classes(font_size.xl, font_weight.semibold, m.b(2))),
-                            P("Navigation mode → Split mode with Enter/Escape.",
-                              cls=combine_classes(text_dui.base_content, m.b(4))),
-                            Div(
-                                Span(
-                                    lucide_icon("corner-down-left", size=3),
-                                    lucide_icon("move-right", size=3),
-                                    Span("Split", cls=m.l(1)),
-                                    cls=combine_classes(badge, badge_colors.primary, m.r(2), flex_display, items.center)
-                                ),
-                                Span(
-                                    lucide_icon("x", size=3),
-                                    lucide_icon("move-right", size=3),
-                                    Span("Exit", cls=m.l(1)),
-                                    cls=combine_classes(badge, badge_colors.secondary, flex_display, items.center)
-                                ),
-                                cls=combine_classes(flex_display, items.center, m.b(4))
-                            ),
-                            A(
-                                Span("Try Demo", cls=m.r(1)),
-                                lucide_icon("arrow-right", size=4),
-                                href=demo_modes.to(),
-                                cls=combine_classes(btn, btn_colors.accent, flex_display, items.center)
-                            ),
-                            cls=card_body
-                        ),
-                        cls=combine_classes(card, bg_dui.base_200)
-                    ),
+    # Referenced from every page head, so it is only fetched once per client
+    app.hdrs.append(Script(src=dual_callbacks_js.to(v=_DUAL_CALLBACKS_HASH)))
 
-                    # Custom keys card
-                    Div(
-                        Div(
-                            H2("Custom Key Mappings",
-                               cls=combine_classes(font_size.xl, font_weight.semibold, m.b(2))),
-                            P("WASD, Vim, or custom key mappings for navigation.",
-                              cls=combine_classes(text_dui.base_content, m.b(4))),
-                            Div(
-                                Span("WASD", cls=combine_classes(badge, badge_colors.primary, m.r(2))),
-                                Span("Vim (hjkl)", cls=combine_classes(badge, badge_colors.secondary)),
-                                cls=combine_classes(flex_display, items.center, m.b(4))
-                            ),
-                            A(
-                                Span("Try Demo", cls=m.r(1)),
-                                lucide_icon("arrow-right", size=4),
-                                href=demo_wasd.to(),
-                                cls=combine_classes(btn, btn_colors.info, flex_display, items.center)
-                            ),
-                            cls=card_body
-                        ),
-                        cls=combine_classes(card, bg_dui.base_200)
-                    ),
+    def demo_simple_content():
+        """Build the simple list demo page content."""
+        return Div(
+            # Header
+            Div(
+                H1("Simple List Navigation",
+                   cls=_PAGE_TITLE_CLS),
+                P("Use arrow keys to navigate, Space to select, Delete to remove.",
+                  cls=_MUTED_TEXT_CLS),
+                cls=_MB4_CLS
+            ),
 
-                    # Hierarchy card
-                    Div(
-                        Div(
-                            H2("Hierarchical Systems",
-                               cls=combine_classes(font_size.xl, font_weight.semibold, m.b(2))),
-                            P("Parent-child keyboard coordination with Escape/Enter activation.",
-                              cls=combine_classes(text_dui.base_content, m.b(4))),
-                            Div(
-                                Span(
-                                    lucide_icon("layers", size=3),
-                                    Span("Hierarchy", cls=m.l(1)),
-                                    cls=combine_classes(badge, badge_colors.primary, m.r(2), flex_display, items.center)
-                                ),
-                                Span(
-                                    Span("Esc", cls=combine_classes(font_family.mono, font_weight.bold)),
-                                    Span("Deactivate", cls=m.l(1)),
-                                    cls=combine_classes(badge, badge_colors.warning, flex_display, items.center)
-                                ),
-                                cls=combine_classes(flex_display, items.center, m.b(4))
-                            ),
-                            A(
-                                Span("Try Demo", cls=m.r(1)),
-                                lucide_icon("arrow-right", size=4),
-                                href=demo_hierarchy.to(),
-                                cls=combine_classes(btn, btn_colors.warning, flex_display, items.center)
-                            ),
-                            cls=card_body
-                        ),
-                        cls=combine_classes(card, bg_dui.base_200)
-                    ),
+            # Keyboard hints
+            simple_system.hints if simple_system.hints else "",
 
-                    cls=combine_classes(
-                        grid_display, grid_cols(1),
-                        grid_cols(2).md,
-                        gap(6), m.b(8)
-                    )
-                ),
+            # List container
+            Div(
+                render_simple_list(),
+                cls=_MT4_CLS
+            ),
 
-                # Features list
-                Div(
-                    H2("Features", cls=combine_classes(font_size._2xl, font_weight.bold, m.b(4))),
-                    Div(
-                        *[Div(
-                            lucide_icon("check", size=4, cls=str(text_dui.success)),
-                            Span(feature, cls=m.l(2)),
-                            cls=combine_classes(flex_display, items.center, m.b(2))
-                        ) for feature in [
-                            "Multi-zone focus management",
-                            "Declarative action bindings",
-                            "Mode system with transitions",
-                            "HTMX + JS callback support",
-                            "Custom key mappings (WASD, Vim, etc.)",
-                            "Hierarchical keyboard systems with coordinator",
-                            "State persistence support",
-                            "Keyboard hints UI",
-                            "Grid navigation ready",
-                        ]],
-                        cls=combine_classes(text_align.left, max_w.md, m.x.auto)
-                    ),
-                    cls=m.b(8)
-                ),
+            # Scripts and hidden elements
+            simple_system.script,
+            simple_system.hidden_inputs,
+            simple_system.action_buttons,
 
-                cls=combine_classes(
-                    container,
-                    max_w._6xl,
-                    m.x.auto,
-                    p(8),
-                    text_align.center
-                )
-            )
-
-        return handle_htmx_request(
-            request,
-            home_content,
-            wrap_fn=lambda content: wrap_with_layout(content, navbar=navbar)
+            cls=_PAGE_2XL_CLS
         )
 
     @router
     def demo_simple(request):
         """Simple single-zone list demo."""
-
-        def demo_content():
-            system = render_keyboard_system(
-                simple_manager,
-                url_map={
-                    "simple-toggle-btn": simple_toggle.to(),
-                    "simple-delete-btn": simple_delete.to(),
-                    "simple-select-all-btn": simple_select_all.to(),
-                },
-                target_map={
-                    "simple-toggle-btn": "#simple-list-container",
-                    "simple-delete-btn": "#simple-list-container",
-                    "simple-select-all-btn": "#simple-list-container",
-                },
-            )
-
-            return Div(
-                # Header
-                Div(
-                    H1("Simple List Navigation",
-                       cls=combine_classes(font_size._2xl, font_weight.bold)),
-                    P("Use arrow keys to navigate, Space to select, Delete to remove.",
-                      cls=combine_classes(text_dui.base_content, font_size.sm)),
-                    cls=combine_classes(m.b(4))
-                ),
-
-                # Keyboard hints
-                system.hints if system.hints else "",
-
-                # List container
-                Div(
-                    render_simple_list(),
-                    cls=combine_classes(m.t(4))
-                ),
-
-                # Scripts and hidden elements
-                system.script,
-                system.hidden_inputs,
-                system.action_buttons,
-
-                cls=combine_classes(container, max_w._2xl, m.x.auto, p(6))
-            )
-
-        return handle_htmx_request(
-            request,
-            demo_content,
-            wrap_fn=lambda content: wrap_with_layout(content, navbar=navbar)
-        )
+        return cached_page(request, "demo_simple", simple_list_state.rev, demo_simple_content)
 
     def render_simple_list():
         """Render the simple list component."""
+        # Snapshot the selection once so handlers mutating it can't affect this render
+        selected = frozenset(simple_list_state.selected_indices)
+        all_selected = simple_list_state.all_selected
         return Div(
             Ul(
-                *[render_list_item(item, item["id"] in simple_list_state.selected_indices)
-                  for item in simple_list_state.items],
+                (cached_list_item(id_, name, all_selected or id_ in selected)
+                 for id_, name in simple_list_state.items),
                 id="simple-list",
-                cls=combine_classes(border(), rounded.lg, overflow.hidden, divide.y())
+                cls=_LIST_CLS
             ),
             id="simple-list-container"
         )
 
+    # Monotonic time of the last applied toggle per existing item, for debouncing key repeat
+    simple_last_toggle: dict[str, float] = {}
+
     @router
     def simple_toggle(request, item_id: str = ""):
         """Toggle item selection."""
-        if item_id:
+        # Unknown ids are ignored so they never get a debounce entry
+        if item_id and simple_list_state.index_of(item_id) is not None:
+            now = time.monotonic()
+            if now - simple_last_toggle.get(item_id, float("-inf")) < _TOGGLE_DEBOUNCE_S:
+                # Repeat within the debounce window: skip the toggle and the swap
+                return Response(status_code=204)
+            simple_last_toggle[item_id] = now
+            if simple_list_state.all_selected:
+                # Materialize "select all" into explicit ids before toggling one
+                simple_list_state.selected_indices = {id_ for id_, _ in simple_list_state.items}
+                simple_list_state.all_selected = False
             if item_id in simple_list_state.selected_indices:
                 simple_list_state.selected_indices.discard(item_id)
             else:
                 simple_list_state.selected_indices.add(item_id)
+            simple_list_state.rev += 1
         return render_simple_list()
 
     @router
     def simple_delete(request, item_id: str = ""):
         """Delete an item."""
         if item_id:
-            simple_list_state.items = [i for i in simple_list_state.items if i["id"] != item_id]
-            simple_list_state.selected_indices.discard(item_id)
+            simple_list_state.remove_item(item_id)
+            simple_last_toggle.pop(item_id, None)
         return render_simple_list()
 
     @router
     def simple_select_all(request):
         """Select all items."""
-        if len(simple_list_state.selected_indices) == len(simple_list_state.items):
-            simple_list_state.selected_indices.clear()
+        if (simple_list_state.all_selected
+                or len(simple_list_state.selected_indices) == len(simple_list_state.items)):
+            simple_list_state.all_selected = False
         else:
-            simple_list_state.selected_indices = {i["id"] for i in simple_list_state.items}
+            simple_list_state.all_selected = True
+        simple_list_state.selected_indices.clear()
+        simple_list_state.rev += 1
         return render_simple_list()
 
-    @router
-    def demo_dual(request):
-        """Dual panel navigation demo."""
+    # Route URLs are static once the handlers are declared, so the URL/target
+    # maps and the keyboard system built from them are created once per demo
+    simple_url_map = {
+        "simple-toggle-btn": simple_toggle.to(),
+        "simple-delete-btn": simple_delete.to(),
+        "simple-select-all-btn": simple_select_all.to(),
+    }
+    simple_target_map = dict.fromkeys(simple_url_map, "#simple-list-container")
+    simple_system = render_keyboard_system(
+        simple_manager,
+        url_map=simple_url_map,
+        target_map=simple_target_map,
+    )
 
-        def demo_content():
-            system = render_keyboard_system(
-                dual_manager,
-                url_map={
-                    "dual-add-btn": dual_add.to(),
-                    "dual-remove-btn": dual_remove.to(),
-                    "dual-move-up-btn": dual_move_up.to(),
-                    "dual-move-down-btn": dual_move_down.to(),
-                },
-                target_map={
-                    "dual-add-btn": "#dual-panels",
-                    "dual-remove-btn": "#dual-panels",
-                    "dual-move-up-btn": "#dual-panels",
-                    "dual-move-down-btn": "#dual-panels",
-                },
-            )
-
-            return Div(
-                # Header
-                Div(
-                    H1("Dual Panel Navigation",
-                       cls=combine_classes(font_size._2xl, font_weight.bold)),
-                    P("Use ←/→ to switch panels, Space to add, Delete to remove, Shift+↑/↓ to reorder.",
-                      cls=combine_classes(text_dui.base_content, font_size.sm)),
-                    cls=combine_classes(m.b(4))
-                ),
+    def demo_dual_content():
+        """Build the dual panel demo page content."""
+        return Div(
+            # Header
+            Div(
+                H1("Dual Panel Navigation",
+                   cls=_PAGE_TITLE_CLS),
+                P("Use ←/→ to switch panels, Space to add, Delete to remove, Shift+↑/↓ to reorder.",
+                  cls=_MUTED_TEXT_CLS),
+                cls=_MB4_CLS
+            ),
 
-                # Keyboard hints
-                system.hints if system.hints else "",
+            # Keyboard hints
+            dual_system.hints if dual_system.hints else "",
 
-                # Panels
-                Div(
-                    render_dual_panels(),
-                    cls=combine_classes(m.t(4))
-                ),
+            # Panels
+            Div(
+                render_dual_panels(),
+                cls=_MT4_CLS
+            ),
+
+            # Scripts and hidden elements
+            dual_system.script,
+            dual_system.hidden_inputs,
+            dual_system.action_buttons,
 
-                # Scripts and hidden elements
-                system.script,
-                system.hidden_inputs,
-                system.action_buttons,
-
-                # JS callbacks for focus change
-                Script("""
-                    function onSourceFocusChange(item, index, zoneId) {
-                        console.log('Source focus:', item?.dataset?.itemId, 'at index', index);
-                    }
-                    function onQueueFocusChange(item, index, zoneId) {
-                        console.log('Queue focus:', item?.dataset?.itemId, 'at index', index);
-                    }
-                """),
-
-                cls=combine_classes(container, max_w._4xl, m.x.auto, p(6))
-            )
-
-        return handle_htmx_request(
-            request,
-            demo_content,
-            wrap_fn=lambda content: wrap_with_layout(content, navbar=navbar)
+            cls=_PAGE_4XL_CLS
+        )
+
+    @router
+    def demo_dual(request):
+        """Dual panel navigation demo."""
+        return cached_page(request, "demo_dual", dual_panel_state.rev, demo_dual_content)
+
+    def render_source_panel():
+        """Render the source list (its items never change, so it is serialized once)."""
+        return source_panel_html
+
+    def render_queue_panel():
+        """Render the queue list."""
+        queue = dual_panel_state.queue  # published tuple; read once
+        return Ul(
+            (cached_list_item(id_, dual_panel_state.name_of(id_), False)
+             for id_ in queue) if queue else Li(
+                P("Queue is empty", cls=_MUTED_TEXT_CLS),
+                cls=_EMPTY_ITEM_CLS
+            ),
+            id="queue-panel",
+            cls=_PANEL_UL_CLS
         )
 
     def render_dual_panels():
@@ -797,168 +1130,135 @@ def main():
             Div(
                 # Source panel
                 Div(
-                    H3("Source Items", cls=combine_classes(font_weight.semibold, m.b(2))),
-                    Ul(
-                        *[render_list_item(item) for item in dual_panel_state.items],
-                        id="source-panel",
-                        cls=combine_classes(border(), rounded.lg, overflow.hidden, divide.y(), min_h(64))
-                    ),
-                    cls=combine_classes(grow(), p(2))
+                    H3("Source Items", cls=_PANEL_TITLE_CLS),
+                    render_source_panel(),
+                    cls=_PANEL_CLS
                 ),
 
                 # Queue panel
                 Div(
-                    H3("Queue", cls=combine_classes(font_weight.semibold, m.b(2))),
-                    Ul(
-                        *[render_list_item({"id": item["id"], "name": item["name"]})
-                          for item in dual_panel_state.queue] if dual_panel_state.queue else [
-                            Li(
-                                P("Queue is empty", cls=combine_classes(text_dui.base_content, font_size.sm)),
-                                cls=combine_classes(p(4), text_align.center)
-                            )
-                        ],
-                        id="queue-panel",
-                        cls=combine_classes(border(), rounded.lg, overflow.hidden, divide.y(), min_h(64))
-                    ),
-                    cls=combine_classes(grow(), p(2))
+                    H3("Queue", cls=_PANEL_TITLE_CLS),
+                    render_queue_panel(),
+                    cls=_PANEL_CLS
                 ),
 
-                cls=combine_classes(grid_display, grid_cols(2), gap(4))
+                cls=_PANEL_GRID_CLS
             ),
             id="dual-panels"
         )
 
+    source_panel_html = NotStr(to_xml(Ul(
+        (cached_list_item(id_, name, False)
+         for id_, name in dual_panel_state.items),
+        id="source-panel",
+        cls=_PANEL_UL_CLS
+    )))
+
     @router
     def dual_add(request, item_id: str = ""):
         """Add item to queue."""
         if item_id:
-            item = next((i for i in dual_panel_state.items if i["id"] == item_id), None)
-            if item and item not in dual_panel_state.queue:
-                dual_panel_state.queue.append(item)
-        return render_dual_panels()
+            dual_panel_state.enqueue(item_id)
+        return render_queue_panel()
 
     @router
     def dual_remove(request, item_id: str = ""):
         """Remove item from queue."""
         if item_id:
-            dual_panel_state.queue = [i for i in dual_panel_state.queue if i["id"] != item_id]
-        return render_dual_panels()
+            dual_panel_state.dequeue(item_id)
+        return render_queue_panel()
 
     @router
     def dual_move_up(request, item_id: str = ""):
         """Move item up in queue."""
         if item_id:
-            for i, item in enumerate(dual_panel_state.queue):
-                if item["id"] == item_id and i > 0:
-                    dual_panel_state.queue[i], dual_panel_state.queue[i-1] = \
-                        dual_panel_state.queue[i-1], dual_panel_state.queue[i]
-                    break
-        return render_dual_panels()
+            dual_panel_state.move_queued(item_id, -1)
+        return render_queue_panel()
 
     @router
     def dual_move_down(request, item_id: str = ""):
         """Move item down in queue."""
         if item_id:
-            for i, item in enumerate(dual_panel_state.queue):
-                if item["id"] == item_id and i < len(dual_panel_state.queue) - 1:
-                    dual_panel_state.queue[i], dual_panel_state.queue[i+1] = \
-                        dual_panel_state.queue[i+1], dual_panel_state.queue[i]
-                    break
-        return render_dual_panels()
+            dual_panel_state.move_queued(item_id, 1)
+        return render_queue_panel()
+
+    # Keyboard system (built once)
+    dual_url_map = {
+        "dual-add-btn": dual_add.to(),
+        "dual-remove-btn": dual_remove.to(),
+        "dual-move-up-btn": dual_move_up.to(),
+        "dual-move-down-btn": dual_move_down.to(),
+    }
+    # Only the queue changes, so actions swap the queue list alone
+    dual_target_map = dict.fromkeys(dual_url_map, "#queue-panel")
+    dual_system = render_keyboard_system(
+        dual_manager,
+        url_map=dual_url_map,
+        target_map=dual_target_map,
+    )
 
-    @router
-    def demo_modes(request):
-        """Mode switching demo."""
+    def demo_modes_content():
+        """Build the mode switching demo page content."""
+        return Div(
+            # Header
+            Div(
+                H1("Mode Switching",
+                   cls=_PAGE_TITLE_CLS),
+                P("Press Enter to enter Split mode, Escape to exit. Use ↑/↓ to navigate segments. (Caret movement not implemented in demo)",
+                  cls=_MUTED_TEXT_CLS),
+                cls=_MB4_CLS
+            ),
 
-        def demo_content():
-            system = render_keyboard_system(
-                mode_manager,
-                url_map={
-                    "mode-merge-btn": mode_merge.to(),
-                    "mode-split-btn": mode_split.to(),
-                },
-                target_map={
-                    "mode-merge-btn": "#segment-container",
-                    "mode-split-btn": "#segment-container",
-                },
-            )
-
-            return Div(
-                # Header
-                Div(
-                    H1("Mode Switching",
-                       cls=combine_classes(font_size._2xl, font_weight.bold)),
-                    P("Press Enter to enter Split mode, Escape to exit. Use ↑/↓ to navigate segments. (Caret movement not implemented in demo)",
-                      cls=combine_classes(text_dui.base_content, font_size.sm)),
-                    cls=combine_classes(m.b(4))
+            # Mode indicator
+            Div(
+                Span("Current Mode: ", cls=font_weight.semibold),
+                Span(
+                    mode_demo_state["mode"].title(),
+                    id="mode-indicator",
+                    cls=_MODE_BADGE_NAV_CLS if mode_demo_state["mode"] == "navigation" else _MODE_BADGE_SPLIT_CLS
                 ),
+                cls=_MB4_CLS
+            ),
 
-                # Mode indicator
-                Div(
-                    Span("Current Mode: ", cls=font_weight.semibold),
-                    Span(
-                        mode_demo_state["mode"].title(),
-                        id="mode-indicator",
-                        cls=combine_classes(
-                            badge,
-                            badge_colors.primary if mode_demo_state["mode"] == "navigation" else badge_colors.warning
-                        )
-                    ),
-                    cls=combine_classes(m.b(4))
-                ),
+            # Keyboard hints
+            mode_system.hints if mode_system.hints else "",
 
-                # Keyboard hints
-                system.hints if system.hints else "",
+            # Segments
+            Div(
+                render_segments(),
+                cls=_MT4_CLS
+            ),
 
-                # Segments
-                Div(
-                    render_segments(),
-                    cls=combine_classes(m.t(4))
-                ),
+            # Scripts and hidden elements
+            mode_system.script,
+            mode_system.hidden_inputs,
+            mode_system.action_buttons,
+
+            # JS callbacks for mode changes
+            Script(src=mode_callbacks_js.to(v=_MODE_CALLBACKS_HASH)),
 
-                # Scripts and hidden elements
-                system.script,
-                system.hidden_inputs,
-                system.action_buttons,
-
-                # JS callbacks for mode changes
-                Script("""
-                    function enterSplitMode(modeName, zoneId) {
-                        console.log('Entered split mode');
-                        document.getElementById('mode-indicator').textContent = 'Split';
-                        document.getElementById('mode-indicator').className = 'badge badge-warning';
-                    }
-                    function exitSplitMode(modeName, zoneId) {
-                        console.log('Exited split mode');
-                        document.getElementById('mode-indicator').textContent = 'Navigation';
-                        document.getElementById('mode-indicator').className = 'badge badge-primary';
-                    }
-                    function onModeChange(newMode, oldMode) {
-                        console.log('Mode changed from', oldMode, 'to', newMode);
-                    }
-                """),
-
-                cls=combine_classes(container, max_w._3xl, m.x.auto, p(6))
-            )
-
-        return handle_htmx_request(
-            request,
-            demo_content,
-            wrap_fn=lambda content: wrap_with_layout(content, navbar=navbar)
+            cls=_PAGE_3XL_CLS
         )
 
+    @router
+    def demo_modes(request):
+        """Mode switching demo."""
+        return cached_page(request, "demo_modes", mode_demo_state["rev"], demo_modes_content)
+
     def render_segments():
         """Render segment cards."""
+        segments = mode_demo_state["segments"]  # published tuple; read once
+        active = mode_demo_state["active_segment"]
         return Div(
             Div(
-                *[render_segment_card(
+                (render_segment_card(
                     seg, i,
-                    is_active=(i == mode_demo_state["active_segment"]),
+                    is_active=(i == active),
                     mode=mode_demo_state["mode"],
                     caret_pos=mode_demo_state["caret_position"]
-                ) for i, seg in enumerate(mode_demo_state["segments"])],
+                ) for i, seg in enumerate(segments)),
                 id="segment-list",
-                cls=combine_classes(flex_display, flex_direction.col, gap(4))
+                cls=_SEGMENT_LIST_CLS
             ),
             id="segment-container"
         )
@@ -966,14 +1266,22 @@ def main():
     @router
     def mode_merge(request, segment_id: str = ""):
         """Merge segment with previous."""
-        segments = mode_demo_state["segments"]
-        for i, seg in enumerate(segments):
-            if seg["id"] == segment_id and i > 0:
+        with mode_write_lock:
+            segments = mode_demo_state["segments"]
+            i = mode_demo_state["segment_pos"].get(segment_id)
+            if i:
                 # Merge text
-                segments[i-1]["text"] = segments[i-1]["text"] + " " + seg["text"]
-                segments.pop(i)
-                mode_demo_state["active_segment"] = max(0, i - 1)
-                break
+                seg, prev = segments[i], segments[i-1]
+                merged = MappingProxyType({**prev, "text": " ".join((prev["text"], seg["text"]))})
+                segments = segments[:i-1] + (merged,) + segments[i+1:]
+                mode_demo_state["segments"] = segments
+                # segment_pos is only read under the lock, so shift it in place
+                segment_pos = mode_demo_state["segment_pos"]
+                del segment_pos[segment_id]
+                for later in segments[i:]:
+                    segment_pos[later["id"]] -= 1
+                mode_demo_state["active_segment"] = i - 1
+                mode_demo_state["rev"] += 1
         return render_segments()
 
     @router
@@ -983,95 +1291,104 @@ def main():
         # For demo, we just show that the action is triggered
         return render_segments()
 
-    @router
-    def demo_wasd(request):
-        """Custom key mapping demo."""
-
-        def demo_content():
-            system = render_keyboard_system(
-                wasd_manager,
-                url_map={
-                    "wasd-action-btn": wasd_action.to(),
-                },
-                target_map={
-                    "wasd-action-btn": "#wasd-list-container",
-                },
-            )
-
-            return Div(
-                # Header
-                Div(
-                    H1("Custom Key Mappings",
-                       cls=combine_classes(font_size._2xl, font_weight.bold)),
-                    P("Use W/S to navigate up/down, F to interact.",
-                      cls=combine_classes(text_dui.base_content, font_size.sm)),
-                    cls=combine_classes(m.b(4))
-                ),
+    # Keyboard system (built once)
+    mode_url_map = {
+        "mode-merge-btn": mode_merge.to(),
+        "mode-split-btn": mode_split.to(),
+    }
+    mode_target_map = dict.fromkeys(mode_url_map, "#segment-container")
+    mode_system = render_keyboard_system(
+        mode_manager,
+        url_map=mode_url_map,
+        target_map=mode_target_map,
+    )
 
-                # Key mapping info
-                Div(
-                    H3("Active Mapping: WASD", cls=combine_classes(font_weight.semibold, m.b(2))),
-                    Div(
-                        Span("W = Up", cls=combine_classes(badge, badge_colors.accent, m.r(2))),
-                        Span("S = Down", cls=combine_classes(badge, badge_colors.accent, m.r(2))),
-                        Span("A = Left", cls=combine_classes(badge, badge_colors.accent, m.r(2))),
-                        Span("D = Right", cls=combine_classes(badge, badge_colors.accent)),
-                    ),
-                    cls=combine_classes(m.b(4), p(4), bg_dui.base_200, rounded.lg)
-                ),
+    def demo_wasd_content():
+        """Build the custom key mapping demo page content."""
+        return Div(
+            # Header
+            Div(
+                H1("Custom Key Mappings",
+                   cls=_PAGE_TITLE_CLS),
+                P("Use W/S to navigate up/down, F to interact.",
+                  cls=_MUTED_TEXT_CLS),
+                cls=_MB4_CLS
+            ),
 
-                # Keyboard hints
-                system.hints if system.hints else "",
+            # Key mapping info
+            _WASD_MAPPING_INFO,
 
-                # List container
-                Div(
-                    render_wasd_list(),
-                    cls=combine_classes(m.t(4))
-                ),
+            # Keyboard hints
+            wasd_system.hints if wasd_system.hints else "",
 
-                # Scripts and hidden elements
-                system.script,
-                system.hidden_inputs,
-                system.action_buttons,
+            # List container
+            Div(
+                render_wasd_list(),
+                cls=_MT4_CLS
+            ),
 
-                cls=combine_classes(container, max_w._2xl, m.x.auto, p(6))
-            )
+            # Scripts and hidden elements
+            wasd_system.script,
+            wasd_system.hidden_inputs,
+            wasd_system.action_buttons,
 
-        return handle_htmx_request(
-            request,
-            demo_content,
-            wrap_fn=lambda content: wrap_with_layout(content, navbar=navbar)
+            cls=_PAGE_2XL_CLS
         )
 
+    @router
+    def demo_wasd(request):
+        """Custom key mapping demo."""
+        return cached_page(request, "demo_wasd", wasd_demo_state.rev, demo_wasd_content)
+
+    # Serialized WASD list per selection state; the items themselves never change,
+    # and keys only ever hold real item ids, so there are at most 2**len(items)
+    wasd_list_cache: dict[frozenset, str] = {}
+
     def render_wasd_list():
         """Render the WASD demo list."""
-        return Div(
-            Ul(
-                *[render_list_item(item, item["id"] in wasd_demo_state.selected_indices)
-                  for item in wasd_demo_state.items],
-                id="wasd-list",
-                cls=combine_classes(border(), rounded.lg, overflow.hidden, divide.y())
-            ),
-            id="wasd-list-container"
+        selected = frozenset(wasd_demo_state.selected_indices).intersection(
+            id_ for id_, _ in wasd_demo_state.items
         )
+        html = wasd_list_cache.get(selected)
+        if html is None:
+            html = wasd_list_cache[selected] = to_xml(Div(
+                Ul(
+                    (cached_list_item(id_, name, id_ in selected)
+                     for id_, name in wasd_demo_state.items),
+                    id="wasd-list",
+                    cls=_LIST_CLS
+                ),
+                id="wasd-list-container"
+            ))
+        return NotStr(html)
 
     @router
     def wasd_action(request, item_id: str = ""):
         """Handle WASD action - toggle item selection."""
-        if item_id:
+        if item_id and wasd_demo_state.index_of(item_id) is not None:
             if item_id in wasd_demo_state.selected_indices:
                 wasd_demo_state.selected_indices.discard(item_id)
             else:
                 wasd_demo_state.selected_indices.add(item_id)
+            wasd_demo_state.rev += 1
         return render_wasd_list()
 
+    # Keyboard system (built once)
+    wasd_url_map = {"wasd-action-btn": wasd_action.to()}
+    wasd_target_map = {"wasd-action-btn": "#wasd-list-container"}
+    wasd_system = render_keyboard_system(
+        wasd_manager,
+        url_map=wasd_url_map,
+        target_map=wasd_target_map,
+    )
+
     # =========================================================================
     # Demo 5: Hierarchical Systems
     # =========================================================================
 
     # State for child lists
-    child_a_state = DemoState(
-        items=[
+    child_a_state = DemoState.from_items(
+        [
             {"id": "a1", "name": "Alpha Item 1"},
             {"id": "a2", "name": "Alpha Item 2"},
             {"id": "a3", "name": "Alpha Item 3"},
@@ -1080,8 +1397,8 @@ def main():
         ]
     )
 
-    child_b_state = DemoState(
-        items=[
+    child_b_state = DemoState.from_items(
+        [
             {"id": "b1", "name": "Beta Item 1"},
             {"id": "b2", "name": "Beta Item 2"},
             {"id": "b3", "name": "Beta Item 3"},
@@ -1089,107 +1406,14 @@ def main():
         ]
     )
 
-    # --- Child system A: vertical list ---
-    child_a_zone = FocusZone(
-        id="child-a-list",
-        item_selector="li[data-item-id]",
-        navigation=LinearVertical(),
-        data_attributes=("item-id",),
-        zone_focus_classes=(str(ring(2)), str(ring_dui.primary), str(inset_ring(2))),
-        item_focus_classes=(str(bg_dui.primary.opacity(20)), str(ring(1)), str(ring_dui.primary)),
-    )
-    child_a_actions = (
-        KeyAction(
-            key=" ",
-            htmx_trigger="child-a-toggle-btn",
-            description="Toggle selection",
-            hint_group="Selection",
-        ),
-        KeyAction(
-            key="Enter",
-            htmx_trigger="child-a-toggle-btn",
-            description="Toggle selection",
-            hint_group="Selection",
-            show_in_hints=False,
-        ),
-    )
-    child_a_manager = ZoneManager(
-        zones=(child_a_zone,),
-        actions=child_a_actions,
-        system_id="child-a",
-    )
-
-    # --- Child system B: vertical list ---
-    child_b_zone = FocusZone(
-        id="child-b-list",
-        item_selector="li[data-item-id]",
-        navigation=LinearVertical(),
-        data_attributes=("item-id",),
-        zone_focus_classes=(str(ring(2)), str(ring_dui.secondary), str(inset_ring(2))),
-        item_focus_classes=(str(bg_dui.secondary.opacity(20)), str(ring(1)), str(ring_dui.secondary)),
-    )
-    child_b_actions = (
-        KeyAction(
-            key=" ",
-            htmx_trigger="child-b-toggle-btn",
-            description="Toggle selection",
-            hint_group="Selection",
-        ),
-        KeyAction(
-            key="Enter",
-            htmx_trigger="child-b-toggle-btn",
-            description="Toggle selection",
-            hint_group="Selection",
-            show_in_hints=False,
-        ),
-    )
-    child_b_manager = ZoneManager(
-        zones=(child_b_zone,),
-        actions=child_b_actions,
-        system_id="child-b",
-    )
-
-    # --- Parent system: ghost zones for target navigation ---
-    from cjm_fasthtml_keyboard_navigation.core.navigation import ScrollOnly
-
-    ghost_zone_a = FocusZone(
-        id="ghost-a",
-        item_selector=None,
-        navigation=ScrollOnly(),
-        zone_focus_classes=(str(ring(2)), str(ring_dui.primary)),
-    )
-    ghost_zone_b = FocusZone(
-        id="ghost-b",
-        item_selector=None,
-        navigation=ScrollOnly(),
-        zone_focus_classes=(str(ring(2)), str(ring_dui.secondary)),
-    )
-
-    parent_actions = (
-        # Enter activates the child corresponding to the active ghost zone
-        KeyAction(
-            key="Enter",
-            js_callback="activateHighlightedChild",
-            description="Activate area",
-            hint_group="Navigation",
-        ),
-    )
-    parent_manager = ZoneManager(
-        zones=(ghost_zone_a, ghost_zone_b),
-        actions=parent_actions,
-        system_id="hierarchy-parent",
-        prev_zone_key="ArrowLeft",
-        next_zone_key="ArrowRight",
-    )
-
     def render_child_a_list():
         """Render child A list."""
         return Div(
             Ul(
-                *[render_list_item(item, item["id"] in child_a_state.selected_indices)
-                  for item in child_a_state.items],
+                (cached_list_item(id_, name, id_ in child_a_state.selected_indices)
+                 for id_, name in child_a_state.items),
                 id="child-a-list",
-                cls=combine_classes(border(), rounded.lg, overflow.hidden, divide.y())
+                cls=_LIST_CLS
             ),
             id="child-a-container"
         )
@@ -1198,10 +1422,10 @@ def main():
         """Render child B list."""
         return Div(
             Ul(
-                *[render_list_item(item, item["id"] in child_b_state.selected_indices)
-                  for item in child_b_state.items],
+                (cached_list_item(id_, name, id_ in child_b_state.selected_indices)
+                 for id_, name in child_b_state.items),
                 id="child-b-list",
-                cls=combine_classes(border(), rounded.lg, overflow.hidden, divide.y())
+                cls=_LIST_CLS
             ),
             id="child-b-container"
         )
@@ -1209,231 +1433,212 @@ def main():
     @router
     def child_a_toggle(request, item_id: str = ""):
         """Toggle selection in child A."""
-        if item_id:
+        if item_id and child_a_state.index_of(item_id) is not None:
             if item_id in child_a_state.selected_indices:
                 child_a_state.selected_indices.discard(item_id)
             else:
                 child_a_state.selected_indices.add(item_id)
+            child_a_state.rev += 1
         return render_child_a_list()
 
     @router
     def child_b_toggle(request, item_id: str = ""):
         """Toggle selection in child B."""
-        if item_id:
+        if item_id and child_b_state.index_of(item_id) is not None:
             if item_id in child_b_state.selected_indices:
                 child_b_state.selected_indices.discard(item_id)
             else:
                 child_b_state.selected_indices.add(item_id)
+            child_b_state.rev += 1
         return render_child_b_list()
 
-    @router
-    def demo_hierarchy(request):
-        """Hierarchical keyboard systems demo."""
+    # All three keyboard systems (built once)
+    parent_system = render_keyboard_system(
+        parent_manager,
+        url_map={},
+        target_map={},
+        show_hints=False,
+    )
 
-        def demo_content():
-            # Render all three keyboard systems
-            parent_system = render_keyboard_system(
-                parent_manager,
-                url_map={},
-                target_map={},
-                show_hints=False,
-            )
-
-            child_a_system = render_keyboard_system(
-                child_a_manager,
-                url_map={
-                    "child-a-toggle-btn": child_a_toggle.to(),
-                },
-                target_map={
-                    "child-a-toggle-btn": "#child-a-container",
-                },
-                show_hints=False,
-            )
-
-            child_b_system = render_keyboard_system(
-                child_b_manager,
-                url_map={
-                    "child-b-toggle-btn": child_b_toggle.to(),
-                },
-                target_map={
-                    "child-b-toggle-btn": "#child-b-container",
-                },
-                show_hints=False,
-            )
-
-            # Status indicator (updated by JS)
-            status_indicator = Div(
-                Span("Active: ", cls=font_weight.semibold),
-                Span("Parent (navigating between areas)", id="hierarchy-status"),
-                cls=combine_classes(
-                    p(3), m.b(4), rounded.lg, bg_dui.base_200,
-                    font_size.sm, font_family.mono,
-                )
-            )
-
-            # Hierarchy setup + activation logic
-            hierarchy_js = Script("""
-            (function() {
-                const coord = window.kbCoordinator;
-
-                // Establish hierarchy
-                coord.setParent('child-a', 'hierarchy-parent');
-                coord.setParent('child-b', 'hierarchy-parent');
-
-                // Map ghost zones to child system IDs
-                const ghostToChild = {
-                    'ghost-a': 'child-a',
-                    'ghost-b': 'child-b',
-                };
+    child_a_url_map = {"child-a-toggle-btn": child_a_toggle.to()}
+    child_a_target_map = {"child-a-toggle-btn": "#child-a-container"}
+    child_a_system = render_keyboard_system(
+        child_a_manager,
+        url_map=child_a_url_map,
+        target_map=child_a_target_map,
+        show_hints=False,
+    )
 
-                const childLabels = {
-                    'child-a': 'Child A (Alpha list)',
-                    'child-b': 'Child B (Beta list)',
-                };
+    child_b_url_map = {"child-b-toggle-btn": child_b_toggle.to()}
+    child_b_target_map = {"child-b-toggle-btn": "#child-b-container"}
+    child_b_system = render_keyboard_system(
+        child_b_manager,
+        url_map=child_b_url_map,
+        target_map=child_b_target_map,
+        show_hints=False,
+    )
+
+    def demo_hierarchy_content():
+        """Build the hierarchical systems demo page content."""
+        # Status indicator (updated by JS)
+        status_indicator = Div(
+            Span("Active: ", cls=font_weight.semibold),
+            Span("Parent (navigating between areas)", id="hierarchy-status"),
+            cls=_HIERARCHY_STATUS_CLS
+        )
 
-                function updateStatus(text) {
-                    const el = document.getElementById('hierarchy-status');
-                    if (el) el.textContent = text;
+        # Hierarchy setup + activation logic
+        hierarchy_js = Script("""
+        (function() {
+            const coord = window.kbCoordinator;
+
+            // Establish hierarchy
+            coord.setParent('child-a', 'hierarchy-parent');
+            coord.setParent('child-b', 'hierarchy-parent');
+
+            // Map ghost zones to child system IDs
+            const ghostToChild = {
+                'ghost-a': 'child-a',
+                'ghost-b': 'child-b',
+            };
+
+            const childLabels = {
+                'child-a': 'Child A (Alpha list)',
+                'child-b': 'Child B (Beta list)',
+            };
+
+            function updateStatus(text) {
+                const el = document.getElementById('hierarchy-status');
+                if (el) el.textContent = text;
+            }
+
+            // Activate highlighted child when Enter is pressed at parent level
+            window.activateHighlightedChild = function(item, index, zoneId, mode) {
+                const childId = ghostToChild[zoneId];
+                if (childId) {
+                    coord.setActiveChild('hierarchy-parent', childId);
+                    updateStatus(childLabels[childId] + ' — press Escape to return');
                 }
+            };
 
-                // Activate highlighted child when Enter is pressed at parent level
-                window.activateHighlightedChild = function(item, index, zoneId, mode) {
-                    const childId = ghostToChild[zoneId];
-                    if (childId) {
-                        coord.setActiveChild('hierarchy-parent', childId);
-                        updateStatus(childLabels[childId] + ' — press Escape to return');
-                    }
+            // Visual feedback on child activation/deactivation
+            const childASys = coord._systems['child-a'];
+            const childBSys = coord._systems['child-b'];
+
+            if (childASys) {
+                childASys.onActivate = function() {
+                    const el = document.getElementById('ghost-a');
+                    if (el) { el.classList.add('ring-2', 'ring-primary'); }
+                };
+                childASys.onDeactivate = function() {
+                    const el = document.getElementById('ghost-a');
+                    if (el) { el.classList.remove('ring-2', 'ring-primary'); }
+                    updateStatus('Parent (navigating between areas)');
                 };
+            }
 
-                // Visual feedback on child activation/deactivation
-                const childASys = coord._systems['child-a'];
-                const childBSys = coord._systems['child-b'];
-
-                if (childASys) {
-                    childASys.onActivate = function() {
-                        const el = document.getElementById('ghost-a');
-                        if (el) { el.classList.add('ring-2', 'ring-primary'); }
-                    };
-                    childASys.onDeactivate = function() {
-                        const el = document.getElementById('ghost-a');
-                        if (el) { el.classList.remove('ring-2', 'ring-primary'); }
-                        updateStatus('Parent (navigating between areas)');
-                    };
-                }
+            if (childBSys) {
+                childBSys.onActivate = function() {
+                    const el = document.getElementById('ghost-b');
+                    if (el) { el.classList.add('ring-2', 'ring-secondary'); }
+                };
+                childBSys.onDeactivate = function() {
+                    const el = document.getElementById('ghost-b');
+                    if (el) { el.classList.remove('ring-2', 'ring-secondary'); }
+                    updateStatus('Parent (navigating between areas)');
+                };
+            }
 
-                if (childBSys) {
-                    childBSys.onActivate = function() {
-                        const el = document.getElementById('ghost-b');
-                        if (el) { el.classList.add('ring-2', 'ring-secondary'); }
-                    };
-                    childBSys.onDeactivate = function() {
-                        const el = document.getElementById('ghost-b');
-                        if (el) { el.classList.remove('ring-2', 'ring-secondary'); }
-                        updateStatus('Parent (navigating between areas)');
-                    };
-                }
+            // Start with no active child (parent navigates between ghost zones)
+            updateStatus('Parent (navigating between areas) — use ←/→ then Enter');
+        })();
+        """)
 
-                // Start with no active child (parent navigates between ghost zones)
-                updateStatus('Parent (navigating between areas) — use ←/→ then Enter');
-            })();
-            """)
+        return Div(
+            # Header
+            Div(
+                H1("Hierarchical Systems",
+                   cls=_PAGE_TITLE_CLS),
+                P("Parent with two child systems. Escape deactivates child, Enter activates.",
+                  cls=_MUTED_TEXT_CLS),
+                cls=_MB4_CLS
+            ),
 
-            return Div(
-                # Header
+            # Instructions
+            Div(
                 Div(
-                    H1("Hierarchical Systems",
-                       cls=combine_classes(font_size._2xl, font_weight.bold)),
-                    P("Parent with two child systems. Escape deactivates child, Enter activates.",
-                      cls=combine_classes(text_dui.base_content, font_size.sm)),
-                    cls=combine_classes(m.b(4))
+                    Span("←/→", cls=_BADGE_ACCENT_CLS),
+                    Span("Navigate between areas (at parent level)"),
+                    cls=_MB1_CLS
                 ),
-
-                # Instructions
                 Div(
-                    Div(
-                        Span("←/→", cls=combine_classes(badge, badge_colors.accent, m.r(2))),
-                        Span("Navigate between areas (at parent level)"),
-                        cls=combine_classes(m.b(1))
-                    ),
-                    Div(
-                        Span("Enter", cls=combine_classes(badge, badge_colors.primary, m.r(2))),
-                        Span("Activate highlighted area"),
-                        cls=combine_classes(m.b(1))
-                    ),
-                    Div(
-                        Span("Escape", cls=combine_classes(badge, badge_colors.warning, m.r(2))),
-                        Span("Deactivate child, return to parent"),
-                        cls=combine_classes(m.b(1))
-                    ),
-                    Div(
-                        Span("↑/↓", cls=combine_classes(badge, badge_colors.info, m.r(2))),
-                        Span("Navigate items (when child is active)"),
-                        cls=combine_classes(m.b(1))
-                    ),
-                    Div(
-                        Span("Space", cls=combine_classes(badge, badge_colors.success, m.r(2))),
-                        Span("Toggle selection (when child is active)"),
-                    ),
-                    cls=combine_classes(m.b(4), p(4), bg_dui.base_200, rounded.lg, font_size.sm)
+                    Span("Enter", cls=_BADGE_PRIMARY_CLS),
+                    Span("Activate highlighted area"),
+                    cls=_MB1_CLS
                 ),
+                Div(
+                    Span("Escape", cls=_BADGE_WARNING_CLS),
+                    Span("Deactivate child, return to parent"),
+                    cls=_MB1_CLS
+                ),
+                Div(
+                    Span("↑/↓", cls=_BADGE_INFO_CLS),
+                    Span("Navigate items (when child is active)"),
+                    cls=_MB1_CLS
+                ),
+                Div(
+                    Span("Space", cls=_BADGE_SUCCESS_CLS),
+                    Span("Toggle selection (when child is active)"),
+                ),
+                cls=_HINTS_BOX_CLS
+            ),
 
-                # Status
-                status_indicator,
+            # Status
+            status_indicator,
 
-                # Two child panels side by side
+            # Two child panels side by side
+            Div(
+                # Child A panel with ghost zone wrapper
                 Div(
-                    # Child A panel with ghost zone wrapper
-                    Div(
-                        H3("Alpha List", cls=combine_classes(
-                            font_weight.semibold, m.b(2), text_dui.primary)),
-                        render_child_a_list(),
-                        id="ghost-a",
-                        cls=combine_classes(
-                            p(4), rounded.lg, border(), border_dui.base_300,
-                            transition.all,
-                        )
-                    ),
-                    # Child B panel with ghost zone wrapper
-                    Div(
-                        H3("Beta List", cls=combine_classes(
-                            font_weight.semibold, m.b(2), text_dui.secondary)),
-                        render_child_b_list(),
-                        id="ghost-b",
-                        cls=combine_classes(
-                            p(4), rounded.lg, border(), border_dui.base_300,
-                            transition.all,
-                        )
-                    ),
-                    cls=combine_classes(
-                        grid_display, grid_cols(2), gap(4), m.b(4),
-                    )
+                    H3("Alpha List", cls=_CHILD_A_TITLE_CLS),
+                    render_child_a_list(),
+                    id="ghost-a",
+                    cls=_CHILD_PANEL_CLS
                 ),
+                # Child B panel with ghost zone wrapper
+                Div(
+                    H3("Beta List", cls=_CHILD_B_TITLE_CLS),
+                    render_child_b_list(),
+                    id="ghost-b",
+                    cls=_CHILD_PANEL_CLS
+                ),
+                cls=_CHILD_GRID_CLS
+            ),
 
-                # All three keyboard systems
-                parent_system.script,
-                parent_system.hidden_inputs,
-                parent_system.action_buttons,
-
-                child_a_system.script,
-                child_a_system.hidden_inputs,
-                child_a_system.action_buttons,
+            # All three keyboard systems
+            parent_system.script,
+            parent_system.hidden_inputs,
+            parent_system.action_buttons,
 
-                child_b_system.script,
-                child_b_system.hidden_inputs,
-                child_b_system.action_buttons,
+            child_a_system.script,
+            child_a_system.hidden_inputs,
+            child_a_system.action_buttons,
 
-                # Hierarchy wiring (must come after all systems are registered)
-                hierarchy_js,
+            child_b_system.script,
+            child_b_system.hidden_inputs,
+            child_b_system.action_buttons,
 
-                cls=combine_classes(container, max_w._4xl, m.x.auto, p(6))
-            )
+            # Hierarchy wiring (must come after all systems are registered)
+            hierarchy_js,
 
-        return handle_htmx_request(
-            request,
-            demo_content,
-            wrap_fn=lambda content: wrap_with_layout(content, navbar=navbar)
+            cls=_PAGE_4XL_CLS
         )
 
+    @router
+    def demo_hierarchy(request):
+        """Hierarchical keyboard systems demo."""
+        return cached_page(request, "demo_hierarchy", (child_a_state.rev, child_b_state.rev), demo_hierarchy_content)
+
     # =========================================================================
     # Navigation
     # =========================================================================
@@ -1453,6 +1658,53 @@ def main():
         theme_selector=True
     )
 
+    # Serialize the page shell (navbar + content container) once and split it
+    # around a placeholder, so full-page responses only render their content
+    shell = wrap_with_layout(NotStr(_CONTENT_PLACEHOLDER), navbar=navbar)
+    shell_pre, shell_post = map(NotStr, "".join(to_xml(c) for c in shell.children).split(_CONTENT_PLACEHOLDER))
+    shell_attrs = shell.attrs
+
+    def wrap_page(content):
+        """Wrap content in the cached page shell for full-page requests."""
+        return Main(shell_pre, content, shell_post, **shell_attrs)
+
+    # Serialized page content per route, tagged with the state revision it was
+    # rendered from; a mutating handler bumps the revision to invalidate it
+    page_cache: dict[str, tuple] = {}
+
+    # Full pages also carry the document head and the page shell, so their
+    # ETag mixes in a hash of everything outside the cached content
+    page_frame_hash = _content_hash("".join((
+        str(shell_pre), str(shell_post), to_xml(app.hdrs), to_xml(app.ftrs),
+        app.title, repr(app.htmlkw), repr(app.bodykw),
+    )).encode())
+
+    def cached_page(request, name, rev, content_fn):
+        """Serve page content from the cache, answering 304 when the client's ETag is current."""
+        entry = page_cache.get(name)
+        if entry is None or entry[0] != rev:
+            html = to_xml(content_fn())
+            digest = _content_hash(html.encode())
+            # Fragment and full-page responses share a URL, so tag them separately
+            entry = page_cache[name] = (rev, html, f'"{digest}-htmx"', f'"{digest}-{page_frame_hash}-page"')
+        # History restores need the full page, matching FastHTML's own rule
+        htmx = bool(request.headers.get("HX-Request")) and "HX-History-Restore-Request" not in request.headers
+        etag = entry[2] if htmx else entry[3]
+        # Same key and value FastHTML uses, so the 200 path keeps a single Vary
+        # header and the 304 path carries it too
+        headers = {"ETag": etag, "Cache-Control": "no-cache", "vary": "HX-Request, HX-History-Restore-Request"}
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+        content = NotStr(entry[1])
+        # Full pages stay an FT so FastHTML still adds the document head
+        return (content if htmx else wrap_page(content)), *(HttpHeader(k, v) for k, v in headers.items())
+
+    # Prewarm the row cache for every demo item in both selection states
+    for state in (simple_list_state, dual_panel_state, wasd_demo_state, child_a_state, child_b_state):
+        for id_, name in state.items:
+            cached_list_item(id_, name, False)
+            cached_list_item(id_, name, True)
+
     # Register all routes
     register_routes(app, router)
 
@@ -1481,7 +1733,6 @@ def main():
 if __name__ == "__main__":
     import uvicorn
     import webbrowser
-    import threading
 
     # Call main to initialize everything and get the app
     app = main()